@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import math
+import shutil
+import subprocess
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+
+COMPACT_SAMPLE_RATE = 16000
+# Lossy inputs (mp3, m4a, ...) are usually smaller than a lossless re-encode, so only
+# uncompressed and lossless files are compacted.
+COMPACTABLE_SUFFIXES = {".wav", ".flac"}
+BLOCK_FRAMES = 1 << 16
+RESAMPLE_TAPS_PER_PHASE = 32
+
+
+@dataclass(frozen=True)
+class CompactedAudio:
+    path: Path
+    original_bytes: int
+    bytes: int
+    seconds: float
+
+    @property
+    def compacted(self) -> bool:
+        return self.bytes < self.original_bytes
+
+    @property
+    def size_ratio(self) -> float:
+        return self.original_bytes / self.bytes if self.bytes else 1.0
+
+
+class PolyphaseResampler:
+    """Streaming rational resampler with a windowed-sinc low-pass filter.
+
+    Blocks of any size can be fed in turn; the output equals resampling the whole
+    signal at once, because the last `taps_per_phase - 1` input samples are carried
+    over to the next block.
+    """
+
+    def __init__(
+        self,
+        source_rate: int,
+        target_rate: int,
+        taps_per_phase: int = RESAMPLE_TAPS_PER_PHASE,
+    ) -> None:
+        divisor = math.gcd(source_rate, target_rate)
+        self.up = target_rate // divisor
+        self.down = source_rate // divisor
+        self.taps = taps_per_phase
+
+        length = taps_per_phase * self.up
+        cutoff = 0.5 / max(self.up, self.down)
+        offsets = np.arange(length) - (length - 1) / 2
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * offsets) * np.kaiser(length, 8.0) * self.up
+        # phases[p, k] is the weight of input sample `base - k` for output phase `p`.
+        self._phases = kernel.reshape(taps_per_phase, self.up).T.copy()
+        self._history = np.zeros(taps_per_phase - 1)
+        self._consumed = 0
+        self._produced = 0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        buffer = np.concatenate([self._history, np.asarray(block, dtype=np.float64)])
+        offset = self._consumed - (self.taps - 1)
+        self._consumed += len(block)
+        return self._emit(buffer, offset, self._consumed)
+
+    def flush(self) -> np.ndarray:
+        # Pad with silence so the last input samples pass through the whole filter.
+        expected = -(-self._consumed * self.up // self.down)
+        produced = self._produced
+        tail = self.process(np.zeros(self.taps))
+        return tail[: max(expected - produced, 0)]
+
+    def _emit(self, buffer: np.ndarray, offset: int, available: int) -> np.ndarray:
+        # Output m reads input up to (m * down) // up, which must already be available.
+        last = (available * self.up - 1) // self.down
+        outputs = np.arange(self._produced, last + 1, dtype=np.int64)
+        self._history = buffer[len(buffer) - (self.taps - 1) :]
+        if not len(outputs):
+            return np.empty(0)
+        self._produced = last + 1
+
+        positions = outputs * self.down
+        bases = positions // self.up - offset
+        windows = buffer[bases[:, None] - np.arange(self.taps)[None, :]]
+        return np.einsum("ij,ij->i", windows, self._phases[positions % self.up])
+
+
+def compact_audio(
+    source: Path,
+    output_dir: Path,
+    sample_rate: int = COMPACT_SAMPLE_RATE,
+) -> CompactedAudio:
+    # Returns the original file when it cannot be compacted or would not get smaller.
+    if output_dir.resolve() == source.parent.resolve():
+        raise ValueError("Compacted audio must be written outside the source directory.")
+    started_at = time.perf_counter()
+    original_bytes = source.stat().st_size
+    target = None
+    if source.suffix.lower() in COMPACTABLE_SUFFIXES:
+        if shutil.which("ffmpeg"):
+            target = compact_with_ffmpeg(source, output_dir / f"{source.stem}.flac", sample_rate)
+        elif source.suffix.lower() == ".wav":
+            target = compact_wav(source, output_dir / f"{source.stem}.wav", sample_rate)
+
+    if target is not None and target.stat().st_size < original_bytes:
+        path = target
+    else:
+        path = source
+    return CompactedAudio(
+        path=path,
+        original_bytes=original_bytes,
+        bytes=path.stat().st_size,
+        seconds=time.perf_counter() - started_at,
+    )
+
+
+def compact_with_ffmpeg(source: Path, target: Path, sample_rate: int) -> Path | None:
+    command = [
+        "ffmpeg",
+        "-nostdin",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        str(source),
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-c:a",
+        "flac",
+        str(target),
+    ]
+    completed = subprocess.run(command, capture_output=True)
+    return target if completed.returncode == 0 else None
+
+
+def compact_wav(source: Path, target: Path, sample_rate: int) -> Path | None:
+    # Mono 16-bit PCM at `sample_rate`, converted block by block so memory stays flat.
+    try:
+        reader = wave.open(str(source), "rb")
+    except (wave.Error, EOFError):
+        return None
+    with reader, wave.open(str(target), "wb") as writer:
+        channels = reader.getnchannels()
+        sample_width = reader.getsampwidth()
+        source_rate = reader.getframerate()
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(min(sample_rate, source_rate))
+        resampler = None
+        if source_rate > sample_rate:
+            resampler = PolyphaseResampler(source_rate, sample_rate)
+
+        while frames := reader.readframes(BLOCK_FRAMES):
+            samples = pcm_to_float(frames, sample_width).reshape(-1, channels).mean(axis=1)
+            if resampler is not None:
+                samples = resampler.process(samples)
+            writer.writeframes(float_to_pcm16(samples))
+        if resampler is not None:
+            writer.writeframes(float_to_pcm16(resampler.flush()))
+    return target
+
+
+def pcm_to_float(frames: bytes, sample_width: int) -> np.ndarray:
+    if sample_width == 1:
+        return (np.frombuffer(frames, dtype=np.uint8).astype(np.float64) - 128) / 128
+    if sample_width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((len(raw), 4), dtype=np.uint8)
+        padded[:, 1:] = raw
+        return padded.view("<i4").ravel().astype(np.float64) / 2**31
+    dtype = {2: "<i2", 4: "<i4"}[sample_width]
+    return np.frombuffer(frames, dtype=dtype).astype(np.float64) / 2 ** (8 * sample_width - 1)
+
+
+def float_to_pcm16(samples: np.ndarray) -> bytes:
+    return np.clip(np.round(samples * 32768), -32768, 32767).astype("<i2").tobytes()
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chapterize import (  # noqa: E402
+    BOUNDARY_RANK_THRESHOLD,
+    RANK_RADIUS,
+    SEGMENT_TOKEN_CACHE,
+    WINDOW_SIZE,
+    add_representative_keywords,
+    add_representative_texts,
+    auto_max_boundaries,
+    build_chapters_from_boundaries,
+    calculate_c99_boundary_scores,
+    load_segments,
+    local_rank_matrix,
+    select_ranked_boundaries,
+    tokenize_keywords,
+)
+
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = BENCHMARK_DIR / "baseline.json"
+DEFAULT_SIZES = [100, 300, 1000, 3000, 10000, 30000, 100000]
+DENSE_MAX_SEGMENTS = 3000
+EMBEDDING_DIMENSION = 256
+REGRESSION_TOLERANCE = 0.5
+# Stages shorter than this are dominated by timer noise and never count as regressions.
+MIN_COMPARED_SEC = 0.01
+TOPIC_SEGMENTS = (20, 80)
+TOPIC_WORDS = [
+    ["예산", "집행", "결산", "회계", "지출", "항목"],
+    ["채용", "면접", "인사", "평가", "교육", "온보딩"],
+    ["서버", "배포", "장애", "모니터링", "로그", "트래픽"],
+    ["전시", "관람", "유물", "큐레이터", "도록", "해설"],
+    ["고객", "문의", "응대", "만족도", "환불", "배송"],
+    ["일정", "마감", "회의", "안건", "보고", "공유"],
+]
+FILLER_WORDS = ["그리고", "그래서", "이번에", "말씀드린", "관련해서", "정리하면", "네", "그", "좀"]
+
+
+def synthetic_transcript(
+    segment_count: int,
+    seed: int = 0,
+) -> tuple[dict[str, Any], np.ndarray]:
+    # Segments are grouped into topics; each topic has its own vocabulary and its own
+    # embedding centre, so the random vectors still produce real chapter boundaries.
+    rng = np.random.default_rng(seed)
+    utterances = []
+    embeddings = np.empty((segment_count, EMBEDDING_DIMENSION), dtype=np.float32)
+    start_at = 0
+    index = 0
+    while index < segment_count:
+        length = min(int(rng.integers(*TOPIC_SEGMENTS)), segment_count - index)
+        words = TOPIC_WORDS[int(rng.integers(len(TOPIC_WORDS)))]
+        centre = rng.normal(size=EMBEDDING_DIMENSION)
+        for _ in range(length):
+            picked = [
+                str(rng.choice(words)) if rng.random() < 0.4 else str(rng.choice(FILLER_WORDS))
+                for _ in range(int(rng.integers(4, 25)))
+            ]
+            duration = 400 * len(picked)
+            utterances.append(
+                {
+                    "start_at": start_at,
+                    "duration": duration,
+                    "spk": int(rng.integers(3)),
+                    "msg": " ".join(picked) + ".",
+                    "lang": "ko",
+                }
+            )
+            embeddings[index] = centre + 0.8 * rng.normal(size=EMBEDDING_DIMENSION)
+            start_at += duration + int(rng.integers(100, 800))
+            index += 1
+
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    payload = {
+        "id": f"synthetic-{segment_count}",
+        "status": "completed",
+        "results": {"utterances": utterances},
+    }
+    return payload, embeddings
+
+
+def timed(timings: dict[str, float], name: str, repeat: int, function: Callable[[], Any]) -> Any:
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started_at)
+    timings[name] = best
+    return result
+
+
+def benchmark_size(segment_count: int, repeat: int, workdir: Path) -> dict[str, float]:
+    payload, embeddings = synthetic_transcript(segment_count, seed=segment_count)
+    transcript_path = workdir / f"synthetic_{segment_count}.transcript.json"
+    transcript_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    timings: dict[str, float] = {}
+    segments = timed(timings, "load_segments", repeat, lambda: load_segments(transcript_path))
+
+    if segment_count <= DENSE_MAX_SEGMENTS:
+        similarities = np.asarray(embeddings @ embeddings.T, dtype=np.float32)
+        timed(
+            timings,
+            "local_rank_matrix",
+            repeat,
+            lambda: local_rank_matrix(similarities, RANK_RADIUS),
+        )
+        timed(
+            timings,
+            "calculate_c99_boundary_scores[dense]",
+            repeat,
+            lambda: calculate_c99_boundary_scores(embeddings, RANK_RADIUS, WINDOW_SIZE),
+        )
+    scores = timed(
+        timings,
+        "calculate_c99_boundary_scores[banded]",
+        repeat,
+        lambda: calculate_c99_boundary_scores(
+            embeddings,
+            RANK_RADIUS,
+            WINDOW_SIZE,
+            similarity_mode="banded",
+        ),
+    )
+    boundaries = timed(
+        timings,
+        "select_ranked_boundaries",
+        repeat,
+        lambda: select_ranked_boundaries(
+            scores,
+            segment_count=segment_count,
+            min_segments=WINDOW_SIZE,
+            max_boundaries=auto_max_boundaries(segments),
+            rank_threshold=BOUNDARY_RANK_THRESHOLD,
+        ),
+    )
+    chapters = build_chapters_from_boundaries(segments, boundaries, scores)
+
+    def add_keywords_uncached() -> None:
+        SEGMENT_TOKEN_CACHE.clear()
+        add_representative_keywords(chapters)
+
+    timed(timings, "add_representative_keywords", repeat, add_keywords_uncached)
+    timed(timings, "add_representative_texts", repeat, lambda: add_representative_texts(chapters))
+    return timings
+
+
+def run_benchmark(sizes: list[int], repeat: int) -> dict[str, dict[str, float]]:
+    # Load the Kiwi model up front so the first size does not pay for it.
+    tokenize_keywords("모델 준비")
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for segment_count in sizes:
+            timings = benchmark_size(segment_count, repeat, Path(directory))
+            for stage, seconds in timings.items():
+                results.setdefault(stage, {})[str(segment_count)] = seconds
+                print(f"stage={stage} segments={segment_count} sec={seconds:.4f}", flush=True)
+    return results
+
+
+def scaling_exponents(results: dict[str, dict[str, float]]) -> dict[str, float | None]:
+    # Slope of log(seconds) against log(segments): ~1 is linear, ~2 quadratic.
+    exponents: dict[str, float | None] = {}
+    for stage, timings in results.items():
+        points = [(int(size), seconds) for size, seconds in timings.items() if seconds > 0]
+        if len(points) < 2:
+            exponents[stage] = None
+            continue
+        sizes, seconds = np.log(np.array(points, dtype=np.float64)).T
+        exponents[stage] = round(float(np.polyfit(sizes, seconds, 1)[0]), 3)
+    return exponents
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float = REGRESSION_TOLERANCE,
+) -> list[str]:
+    regressions = []
+    for stage, timings in results.items():
+        for size, seconds in timings.items():
+            reference = baseline.get(stage, {}).get(size)
+            if reference is None or max(seconds, reference) < MIN_COMPARED_SEC:
+                continue
+            if seconds > reference * (1.0 + tolerance):
+                regressions.append(
+                    f"stage={stage} segments={size} sec={seconds:.4f} baseline={reference:.4f}"
+                )
+    return regressions
+
+
+def render_report(results: dict[str, dict[str, float]]) -> dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+        "scaling_exponents": scaling_exponents(results),
+        "seconds": results,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time the chapter generator stages on synthetic transcripts of growing size."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3, help="Keep the fastest of this many runs.")
+    parser.add_argument("--output", type=Path, default=Path("data/benchmarks/latest.json"))
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=REGRESSION_TOLERANCE,
+        help="Fail when a stage is slower than the baseline by more than this fraction.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run as the new baseline instead of comparing against it.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    results = run_benchmark(sorted(args.sizes), args.repeat)
+    report = render_report(results)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"saved={args.output}")
+    for stage, exponent in report["scaling_exponents"].items():
+        print(f"scaling stage={stage} exponent={exponent}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"saved={args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"baseline_missing={args.baseline}")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["seconds"]
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"regression {regression}")
+    if regressions:
+        raise SystemExit(f"{len(regressions)} stage timing(s) regressed beyond the baseline")
+    print("regressions=0")
+
+
+if __name__ == "__main__":
+    main()
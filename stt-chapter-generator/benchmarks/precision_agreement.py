@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_chapterize import synthetic_transcript  # noqa: E402
+from chapterize import (  # noqa: E402
+    BOUNDARY_RANK_THRESHOLD,
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    PRECISIONS,
+    RANK_RADIUS,
+    WINDOW_SIZE,
+    auto_max_boundaries,
+    c99_boundary_score_array,
+    encode_segments,
+    load_segments,
+    select_ranked_boundaries,
+)
+from embedding_backend import (  # noqa: E402
+    EMBEDDING_BACKENDS,
+    embedding_cache_name,
+    resolve_embedding_backend,
+)
+from embedding_cache import DEFAULT_CACHE_DIR, EmbeddingCache  # noqa: E402
+
+
+DEFAULT_SIZES = [200, 500, 1000, 2000]
+DEFAULT_SEEDS = 10
+MAX_BOUNDARIES = 10
+REDUCED_PRECISIONS = [precision for precision in PRECISIONS if precision != "float32"]
+
+
+def selected_boundaries(
+    embeddings,
+    precision: str,
+    max_boundaries: int = MAX_BOUNDARIES,
+) -> tuple[list[int], float]:
+    tracemalloc.start()
+    scores = c99_boundary_score_array(
+        embeddings,
+        rank_radius=RANK_RADIUS,
+        boundary_window=WINDOW_SIZE,
+        precision=precision,
+    )
+    peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+    boundaries = select_ranked_boundaries(
+        scores,
+        segment_count=len(embeddings),
+        min_segments=WINDOW_SIZE,
+        max_boundaries=max_boundaries,
+        rank_threshold=BOUNDARY_RANK_THRESHOLD,
+    )
+    return boundaries, peak_mb
+
+
+def cache_bytes_per_vector(dimension: int, precision: str, directory: Path) -> int:
+    cache = EmbeddingCache("benchmark/model", cache_dir=directory, dtype=precision)
+    row_bytes = cache.row_bytes(dimension)
+    cache.close()
+    return row_bytes
+
+
+def cache_row_bytes(dimension: int) -> dict[str, int]:
+    with tempfile.TemporaryDirectory() as directory:
+        return {
+            precision: cache_bytes_per_vector(dimension, precision, Path(directory) / precision)
+            for precision in PRECISIONS
+        }
+
+
+def compare_precisions(
+    embeddings,
+    max_boundaries: int = MAX_BOUNDARIES,
+) -> tuple[list[int], dict[str, int], dict[str, float]]:
+    # Returns the float32 boundaries, how many boundaries each reduced precision moved,
+    # and the peak matrix memory of every precision.
+    peaks = {}
+    reference, peaks["float32"] = selected_boundaries(embeddings, "float32", max_boundaries)
+    moved = {}
+    for precision in REDUCED_PRECISIONS:
+        boundaries, peaks[precision] = selected_boundaries(embeddings, precision, max_boundaries)
+        moved[precision] = len(set(boundaries) ^ set(reference))
+    return reference, moved, peaks
+
+
+def agreement_summary(
+    runs: int,
+    reference_boundaries: int,
+    changed_runs: dict[str, int],
+    moved_boundaries: dict[str, int],
+    peaks: dict[str, float],
+    row_bytes: dict[str, int],
+) -> dict[str, Any]:
+    return {
+        "runs": runs,
+        "reference_boundaries": reference_boundaries,
+        "peak_matrix_mb": {precision: round(peak, 2) for precision, peak in peaks.items()},
+        "cache_bytes_per_vector": row_bytes,
+        **{
+            precision: {
+                "changed_run_ratio": round(changed_runs[precision] / runs, 3),
+                "moved_boundary_ratio": round(
+                    moved_boundaries[precision] / max(2 * reference_boundaries, 1), 3
+                ),
+            }
+            for precision in REDUCED_PRECISIONS
+        },
+    }
+
+
+def print_agreement(label: str, summary: dict[str, Any]) -> None:
+    for precision in REDUCED_PRECISIONS:
+        print(
+            f"{label} precision={precision} "
+            f"changed_run_ratio={summary[precision]['changed_run_ratio']} "
+            f"moved_boundary_ratio={summary[precision]['moved_boundary_ratio']} "
+            f"peak_matrix_mb={summary['peak_matrix_mb'][precision]} "
+            f"float32_peak_matrix_mb={summary['peak_matrix_mb']['float32']} "
+            f"cache_bytes_per_vector={summary['cache_bytes_per_vector'][precision]} "
+            f"float32_cache_bytes_per_vector={summary['cache_bytes_per_vector']['float32']}",
+            flush=True,
+        )
+
+
+def measure_agreement(sizes: list[int], seeds: int) -> dict[str, Any]:
+    summary: dict[str, Any] = {}
+    for size in sizes:
+        changed_runs = {precision: 0 for precision in REDUCED_PRECISIONS}
+        moved_boundaries = {precision: 0 for precision in REDUCED_PRECISIONS}
+        reference_boundaries = 0
+        for seed in range(seeds):
+            _, embeddings = synthetic_transcript(size, seed=seed)
+            reference, moved, peaks = compare_precisions(embeddings)
+            reference_boundaries += len(reference)
+            for precision, count in moved.items():
+                changed_runs[precision] += count > 0
+                moved_boundaries[precision] += count
+
+        summary[str(size)] = agreement_summary(
+            seeds,
+            reference_boundaries,
+            changed_runs,
+            moved_boundaries,
+            peaks,
+            cache_row_bytes(embeddings.shape[1]),
+        )
+        print_agreement(f"segments={size}", summary[str(size)])
+    return summary
+
+
+def measure_transcript_agreement(
+    transcript_paths: list[Path],
+    backend: str,
+    cache: EmbeddingCache | None = None,
+    threads: int | None = None,
+) -> dict[str, Any]:
+    # Real transcripts use the chapterize.py boundary limit instead of MAX_BOUNDARIES.
+    summary: dict[str, Any] = {}
+    for transcript_path in transcript_paths:
+        segments = load_segments(transcript_path)
+        embeddings = encode_segments(
+            segments, EMBEDDING_MODEL, cache=cache, backend=backend, threads=threads
+        )
+        reference, moved, peaks = compare_precisions(embeddings, auto_max_boundaries(segments))
+        summary[str(transcript_path)] = agreement_summary(
+            1,
+            len(reference),
+            {precision: int(count > 0) for precision, count in moved.items()},
+            moved,
+            peaks,
+            cache_row_bytes(embeddings.shape[1]),
+        )
+        print_agreement(
+            f"transcript={transcript_path} segments={len(segments)}",
+            summary[str(transcript_path)],
+        )
+    return summary
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure how often reduced-precision similarities change the selected boundaries."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seeds", type=int, default=DEFAULT_SEEDS)
+    parser.add_argument(
+        "--transcripts",
+        type=Path,
+        nargs="+",
+        help="RTZR transcript JSON files to embed and compare instead of synthetic transcripts.",
+    )
+    parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default=EMBEDDING_BACKEND,
+        help="'onnx' exports an int8 ONNX model once; 'auto' uses that export when it exists.",
+    )
+    parser.add_argument(
+        "--embedding-threads",
+        type=int,
+        help="Intra-op CPU threads for the embedding model. Defaults to the runtime's choice.",
+    )
+    parser.add_argument(
+        "--embedding-cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Where to keep float32 segment embeddings between runs.",
+    )
+    parser.add_argument(
+        "--no-embedding-cache",
+        dest="embedding_cache",
+        action="store_false",
+        help="Always encode every segment with the embedding model.",
+    )
+    parser.add_argument("--output", type=Path, default=Path("data/benchmarks/precision.json"))
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.transcripts:
+        summary = measure_agreement(args.sizes, args.seeds)
+    else:
+        backend = resolve_embedding_backend(EMBEDDING_MODEL, args.embedding_backend)
+        cache = None
+        if args.embedding_cache:
+            cache = EmbeddingCache(
+                embedding_cache_name(EMBEDDING_MODEL, backend),
+                cache_dir=args.embedding_cache_dir,
+            )
+        try:
+            summary = measure_transcript_agreement(
+                [path.expanduser().resolve() for path in args.transcripts],
+                backend,
+                cache=cache,
+                threads=args.embedding_threads,
+            )
+        finally:
+            if cache is not None:
+                cache.close()
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(f"saved={args.output}")
+
+
+if __name__ == "__main__":
+    main()
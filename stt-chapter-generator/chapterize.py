@@ -1,50 +1,102 @@
 from __future__ import annotations
 
 import argparse
+import glob
 import json
 import math
+import os
 import re
-from collections import Counter
+import sys
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, Sequence
 
 import numpy as np
 from huggingface_hub.errors import GatedRepoError
 from kiwipiepy import Kiwi
 from sentence_transformers import SentenceTransformer
 
+from embedding_backend import (
+    EMBEDDING_BACKENDS,
+    embedding_cache_name,
+    load_onnx_model,
+    resolve_embedding_backend,
+)
+from embedding_cache import (
+    DEFAULT_CACHE_DIR,
+    DEFAULT_MAX_MB,
+    STORAGE_DTYPES,
+    EmbeddingCache,
+    dequantize_vectors,
+    quantize_vectors,
+)
+from keyword_index import KeywordIndex, normalize_keyword
+from keyword_matcher import KeywordMatcher, range_hit_counts, sliding_window_hits
+from profiling import StageProfiler, profile_stage, record_count
+from segment_store import Segment, SegmentStore, load_segment_store
+
 
 EMBEDDING_MODEL = "google/embeddinggemma-300m"
-EMBEDDING_BATCH_SIZE = 16
+EMBEDDING_MAX_BATCH_SIZE = 128
+EMBEDDING_TOKEN_BUDGET = 4096
+EMBEDDING_BACKEND = "auto"
 RANK_RADIUS = 3
+RANK_ENGINE = "vectorized"
+RANK_ENGINES = ("vectorized", "loop")
+SIMILARITY_MODE = "dense"
+SIMILARITY_MODES = ("dense", "banded")
+SIMILARITY_BLOCK_ROWS = 512
+PRECISION = "float32"
+PRECISIONS = STORAGE_DTYPES
+INT8_SIMILARITY_SCALE = 126
 WINDOW_SIZE = 5
 BOUNDARY_RANK_THRESHOLD = 0.385
 MAX_BOUNDARIES = 10
 BOUNDARY_TEXT_CHARS = 750
 REPRESENTATIVE_KEYWORD_COUNT = 8
 KEYWORD_POS_TAGS = {"NNG", "NNP", "SL"}
+KIWI_NUM_WORKERS = -1
+SEGMENT_TOKEN_CACHE_SIZE = 100_000
 REPRESENTATIVE_MIN_CHARS = 35
 REPRESENTATIVE_TARGET_CHARS = 70
 REPRESENTATIVE_MAX_CHARS = 90
+REPRESENTATIVE_WORKERS = 1
+TRANSCRIPT_GLOB = "*.transcript.json"
 
 @dataclass(frozen=True)
-class Segment:
-    start_at: int
-    text: str
+class EmbeddingBatchStats:
+    size: int
+    tokens: int
+    padded_tokens: int
+    seconds: float
+
+    @property
+    def texts_per_second(self) -> float:
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.seconds if self.seconds > 0 else 0.0
 
 
 @dataclass
 class Chapter:
     start_at: int
-    segments: list[Segment]
+    segments: Sequence[Segment]
     representative_keywords: list[str] | None = None
     representative_text: str = ""
     boundary_score: float | None = None
 
     @property
     def text(self) -> str:
+        if isinstance(self.segments, SegmentStore):
+            return self.segments.text
         return " ".join(segment.text for segment in self.segments)
 
 
@@ -55,46 +107,176 @@ def ms_to_timestamp(ms: int) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
-def load_segments(transcript_path: Path) -> list[Segment]:
-    payload = json.loads(transcript_path.read_text(encoding="utf-8"))
-    utterances = extract_utterances(payload)
-
-    segments = []
-    for item in utterances:
-        text = str(item.get("msg", "")).strip()
-        if not text:
-            continue
-        segments.append(
-            Segment(
-                start_at=int(item.get("start_at", 0)),
-                text=text,
-            )
-        )
-
-    if not segments:
+def load_segments(transcript_path: Path) -> SegmentStore:
+    segments = load_segment_store(transcript_path)
+    if not len(segments):
         raise ValueError("No transcript utterances found.")
     return segments
 
 
-def extract_utterances(payload: Any) -> list[dict[str, Any]]:
-    if isinstance(payload, list):
-        return payload
-    if isinstance(payload, dict):
-        results = payload.get("results", {})
-        if isinstance(results, dict):
-            utterances = results.get("utterances", [])
-            if isinstance(utterances, list):
-                return utterances
-    return []
+def segment_texts(segments: Sequence[Segment]) -> Iterator[str]:
+    if isinstance(segments, SegmentStore):
+        return segments.texts()
+    return (segment.text for segment in segments)
 
 
 def encode_segments(
-    segments: list[Segment],
+    segments: Sequence[Segment],
     model_name: str,
-    batch_size: int,
+    max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+    cache: EmbeddingCache | None = None,
+    token_budget: int = EMBEDDING_TOKEN_BUDGET,
+    batch_stats: list[EmbeddingBatchStats] | None = None,
+    backend: str = "torch",
+    threads: int | None = None,
 ) -> np.ndarray:
+    texts, positions = deduplicate_texts(
+        normalize_segment_text(text) for text in segment_texts(segments)
+    )
+    print(
+        f"unique_segments={len(texts)} total_segments={len(positions)} "
+        f"dedup_ratio={dedup_ratio(len(texts), len(positions)):.3f}"
+    )
+
+    with profile_stage("embedding_cache_lookup"):
+        cached = cache.get(texts) if cache is not None else [None] * len(texts)
+    missing = [index for index, vector in enumerate(cached) if vector is None]
+    if cache is not None:
+        print(f"embedding_cache_hits={len(texts) - len(missing)} misses={len(missing)}")
+
+    if missing:
+        with profile_stage("model_load"):
+            model = get_embedding_model(model_name, backend, threads)
+        with profile_stage("embedding"):
+            encoded, stats = embed_texts(
+                model,
+                [texts[index] for index in missing],
+                token_budget=token_budget,
+                max_batch_size=max_batch_size,
+            )
+        if batch_stats is not None:
+            batch_stats.extend(stats)
+        if cache is not None:
+            with profile_stage("embedding_cache_store"):
+                cache.put([texts[index] for index in missing], encoded)
+        for index, vector in zip(missing, encoded):
+            cached[index] = vector
+
+    unique_embeddings = np.stack(cached).astype(np.float32, copy=False)
+    return unique_embeddings[positions]
+
+
+def embed_texts(
+    model: SentenceTransformer,
+    texts: list[str],
+    token_budget: int = EMBEDDING_TOKEN_BUDGET,
+    max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+) -> tuple[np.ndarray, list[EmbeddingBatchStats]]:
+    lengths = token_lengths(model, texts)
+    batches = length_bucketed_batches(lengths, token_budget, max_batch_size)
+
+    embeddings: np.ndarray | None = None
+    stats = []
+    for number, batch in enumerate(batches, 1):
+        started_at = time.perf_counter()
+        vectors = np.asarray(
+            model.encode(
+                [texts[index] for index in batch],
+                batch_size=len(batch),
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            ),
+            dtype=np.float32,
+        )
+        batch_lengths = lengths[batch]
+        batch_stats = EmbeddingBatchStats(
+            size=len(batch),
+            tokens=int(batch_lengths.sum()),
+            padded_tokens=int(batch_lengths.max()) * len(batch),
+            seconds=time.perf_counter() - started_at,
+        )
+        stats.append(batch_stats)
+        print(
+            f"embedding_batch={number}/{len(batches)} size={batch_stats.size} "
+            f"tokens={batch_stats.tokens} padded_tokens={batch_stats.padded_tokens} "
+            f"texts_per_sec={batch_stats.texts_per_second:.1f} "
+            f"tokens_per_sec={batch_stats.tokens_per_second:.1f}"
+        )
+
+        if embeddings is None:
+            embeddings = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+        embeddings[batch] = vectors
+
+    if embeddings is None:
+        embeddings = np.empty((0, 0), dtype=np.float32)
+    return embeddings, stats
+
+
+def token_lengths(model: SentenceTransformer, texts: list[str]) -> np.ndarray:
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        return np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+
+    encoded = tokenizer(
+        texts,
+        add_special_tokens=True,
+        truncation=True,
+        max_length=model.max_seq_length,
+    )
+    return np.fromiter(
+        (len(ids) for ids in encoded["input_ids"]),
+        dtype=np.int64,
+        count=len(texts),
+    )
+
+
+def length_bucketed_batches(
+    lengths: np.ndarray,
+    token_budget: int,
+    max_batch_size: int,
+) -> list[np.ndarray]:
+    order = np.argsort(-lengths, kind="stable")
+    batches = []
+    start = 0
+    while start < len(order):
+        longest = max(int(lengths[order[start]]), 1)
+        size = min(max(token_budget // longest, 1), max_batch_size)
+        batches.append(order[start : start + size])
+        start += size
+    return batches
+
+
+def deduplicate_texts(texts: Iterable[str]) -> tuple[list[str], np.ndarray]:
+    unique_index: dict[str, int] = {}
+    positions = [unique_index.setdefault(text, len(unique_index)) for text in texts]
+    return list(unique_index), np.asarray(positions, dtype=np.int64)
+
+
+def dedup_ratio(unique_count: int, total_count: int) -> float:
+    if total_count == 0:
+        return 0.0
+    return 1.0 - (unique_count / total_count)
+
+
+def normalize_segment_text(text: str) -> str:
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model(
+    model_name: str,
+    backend: str = "torch",
+    threads: int | None = None,
+) -> SentenceTransformer:
     try:
-        model = SentenceTransformer(model_name)
+        if backend == "onnx":
+            return load_onnx_model(model_name, threads)
+        if threads is not None:
+            import torch
+
+            torch.set_num_threads(threads)
+        return SentenceTransformer(model_name)
     except GatedRepoError as exc:
         raise RuntimeError(
             f"Cannot access embedding model '{model_name}'. "
@@ -103,41 +285,39 @@ def encode_segments(
             "or set `HF_TOKEN`."
         ) from exc
 
-    embeddings = model.encode(
-        [segment.text for segment in segments],
-        batch_size=batch_size,
-        convert_to_numpy=True,
-        normalize_embeddings=True,
-        show_progress_bar=True,
-    )
-    return np.asarray(embeddings)
-
 
 def split_into_chapters_c99(
-    segments: list[Segment],
+    segments: Sequence[Segment],
     embeddings: np.ndarray,
+    rank_engine: str = RANK_ENGINE,
+    similarity_mode: str = SIMILARITY_MODE,
+    precision: str = PRECISION,
 ) -> list[Chapter]:
-    boundary_scores = calculate_c99_boundary_scores(
+    boundary_scores = c99_boundary_score_array(
         embeddings,
         rank_radius=RANK_RADIUS,
         boundary_window=WINDOW_SIZE,
+        rank_engine=rank_engine,
+        similarity_mode=similarity_mode,
+        precision=precision,
     )
-    if not boundary_scores:
+    if not len(boundary_scores):
         return [Chapter(start_at=segments[0].start_at, segments=segments)]
 
-    max_boundaries = auto_max_boundaries(segments)
-    boundaries = select_ranked_boundaries(
-        boundary_scores,
-        segment_count=len(segments),
-        min_segments=WINDOW_SIZE,
-        max_boundaries=max_boundaries,
-        rank_threshold=BOUNDARY_RANK_THRESHOLD,
-    )
+    with profile_stage("boundary_selection"):
+        max_boundaries = auto_max_boundaries(segments)
+        boundaries = select_ranked_boundaries(
+            boundary_scores,
+            segment_count=len(segments),
+            min_segments=WINDOW_SIZE,
+            max_boundaries=max_boundaries,
+            rank_threshold=BOUNDARY_RANK_THRESHOLD,
+        )
     return build_chapters_from_boundaries(segments, boundaries, boundary_scores)
 
 
-def auto_max_boundaries(segments: list[Segment]) -> int:
-    total_chars = sum(len(segment.text) for segment in segments)
+def auto_max_boundaries(segments: Sequence[Segment]) -> int:
+    total_chars = sum(len(text) for text in segment_texts(segments))
     return min(MAX_BOUNDARIES, max(2, round(total_chars / BOUNDARY_TEXT_CHARS)))
 
 
@@ -145,30 +325,157 @@ def calculate_c99_boundary_scores(
     embeddings: np.ndarray,
     rank_radius: int,
     boundary_window: int,
+    rank_engine: str = RANK_ENGINE,
+    similarity_mode: str = SIMILARITY_MODE,
 ) -> dict[int, float]:
+    scores = c99_boundary_score_array(
+        embeddings,
+        rank_radius=rank_radius,
+        boundary_window=boundary_window,
+        rank_engine=rank_engine,
+        similarity_mode=similarity_mode,
+    )
+    return dict(zip(range(1, len(scores) + 1), scores.tolist()))
+
+
+def c99_boundary_score_array(
+    embeddings: np.ndarray,
+    rank_radius: int,
+    boundary_window: int,
+    rank_engine: str = RANK_ENGINE,
+    similarity_mode: str = SIMILARITY_MODE,
+    precision: str = PRECISION,
+) -> np.ndarray:
     segment_count = len(embeddings)
     if segment_count < 2:
-        return {}
+        return np.empty(0, dtype=np.float64)
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision}")
+
+    if similarity_mode == "dense":
+        with profile_stage("similarity"):
+            similarities = similarity_matrix(embeddings, precision)
+        with profile_stage("rank_matrix"):
+            rank_matrix = local_rank_matrix(similarities, rank_radius, engine=rank_engine)
+            del similarities
+        # Only the diagonal band is read below, so skip the n x n float64 prefix sums.
+        with profile_stage("prefix_sums"):
+            rank_band = dense_rank_band(rank_matrix, rank_band_width(boundary_window))
+            del rank_matrix
+            prefix = padded_row_prefix_sum(rank_band)
+    elif similarity_mode == "banded":
+        if precision != "float32":
+            raise ValueError("Reduced precision only applies to dense similarities.")
+        if rank_engine != "vectorized":
+            raise ValueError("Banded similarities only support the vectorized rank engine.")
+        band_width = rank_band_width(boundary_window)
+        with profile_stage("similarity"):
+            similarities = banded_similarities(embeddings, band_width + 2 * rank_radius)
+        with profile_stage("rank_matrix"):
+            rank_band = banded_local_rank_matrix(similarities, rank_radius, band_width)
+        with profile_stage("prefix_sums"):
+            prefix = padded_row_prefix_sum(rank_band)
+    else:
+        raise ValueError(f"Unknown similarity mode: {similarity_mode}")
+
+    with profile_stage("boundary_scores"):
+        return boundary_scores_from_prefix(prefix, segment_count, boundary_window)
+
+
+def boundary_scores_from_prefix(
+    prefix: np.ndarray,
+    segment_count: int,
+    boundary_window: int,
+) -> np.ndarray:
+    # Scores are indexed by `gap - 1`; gap `g` is the boundary before segment `g`.
+    gaps = np.arange(1, segment_count)
+    left_starts = np.maximum(0, gaps - boundary_window)
+    right_ends = np.minimum(segment_count, gaps + boundary_window)
 
-    similarities = np.asarray(embeddings @ embeddings.T, dtype=np.float32)
-    rank_matrix = local_rank_matrix(similarities, rank_radius)
-    prefix = padded_prefix_sum(rank_matrix)
+    left_means = banded_block_means(prefix, left_starts, gaps, left_starts, gaps)
+    right_means = banded_block_means(prefix, gaps, right_ends, gaps, right_ends)
+    cross_means = banded_block_means(prefix, left_starts, gaps, gaps, right_ends)
+    return ((left_means + right_means) / 2.0) - cross_means
 
-    scores: dict[int, float] = {}
-    for gap in range(1, segment_count):
-        left_start = max(0, gap - boundary_window)
-        left_end = gap
-        right_start = gap
-        right_end = min(segment_count, gap + boundary_window)
 
-        left_mean = block_mean(prefix, left_start, left_end, left_start, left_end)
-        right_mean = block_mean(prefix, right_start, right_end, right_start, right_end)
-        cross_mean = block_mean(prefix, left_start, left_end, right_start, right_end)
-        scores[gap] = ((left_mean + right_mean) / 2.0) - cross_mean
-    return scores
+def similarity_matrix(
+    embeddings: np.ndarray,
+    precision: str = PRECISION,
+    block_rows: int = SIMILARITY_BLOCK_ROWS,
+) -> np.ndarray:
+    if precision == "float32":
+        return np.asarray(embeddings @ embeddings.T, dtype=np.float32)
+
+    # NumPy has no fast float16/int8 GEMM, so each row block is multiplied in float32
+    # from the quantized vectors and only the stored matrix is reduced.
+    vectors = dequantize_vectors(*quantize_vectors(embeddings, precision))
+    size = len(vectors)
+    similarities = np.empty((size, size), dtype=precision)
+    for start in range(0, size, block_rows):
+        block = vectors[start : start + block_rows] @ vectors.T
+        similarities[start : start + block_rows] = quantize_similarities(block, precision)
+    return similarities
+
+
+def quantize_similarities(similarities: np.ndarray, precision: str) -> np.ndarray:
+    if precision == "float16":
+        return similarities.astype(np.float16)
+    # int8 similarities stay below the int8 maximum, which rank padding reserves.
+    scaled = np.rint(np.clip(similarities, -1.0, 1.0) * INT8_SIMILARITY_SCALE)
+    return scaled.astype(np.int8)
+
+
+def dense_rank_band(rank_matrix: np.ndarray, band_width: int) -> np.ndarray:
+    size = len(rank_matrix)
+    rows = np.arange(size)[:, None]
+    positions = rows + np.arange(-band_width, band_width + 1)
+    valid = (positions >= 0) & (positions < size)
+    return np.where(valid, rank_matrix[rows, np.clip(positions, 0, size - 1)], 0.0)
+
+
+def local_rank_matrix(
+    similarities: np.ndarray,
+    radius: int,
+    engine: str = RANK_ENGINE,
+) -> np.ndarray:
+    if engine == "vectorized":
+        return local_rank_matrix_vectorized(similarities, radius)
+    if engine == "loop":
+        return local_rank_matrix_loop(similarities, radius)
+    raise ValueError(f"Unknown rank engine: {engine}")
 
 
-def local_rank_matrix(similarities: np.ndarray, radius: int) -> np.ndarray:
+def local_rank_matrix_vectorized(similarities: np.ndarray, radius: int) -> np.ndarray:
+    size = similarities.shape[0]
+    window = 2 * radius + 1
+    reduced = similarities.dtype in (np.float16, np.int8)
+    if not reduced:
+        similarities = similarities.astype(np.float32, copy=False)
+    # NaN padding never satisfies `<=`, so neighbours outside the matrix are not counted.
+    # int8 similarities have no NaN; their padding is the reserved int8 maximum instead.
+    padding = np.iinfo(np.int8).max if similarities.dtype == np.int8 else np.nan
+    padded = np.pad(similarities, radius, mode="constant", constant_values=padding)
+    count_dtype = np.uint8 if window * window <= np.iinfo(np.uint8).max else np.int32
+    counts = np.zeros(similarities.shape, dtype=count_dtype)
+    for row in range(window):
+        for column in range(window):
+            neighbours = padded[row : row + size, column : column + size]
+            counts += neighbours <= similarities
+
+    extents = window_extents(size, radius)
+    ranks = np.empty(similarities.shape, dtype=np.float16 if reduced else np.float32)
+    for start in range(0, size, SIMILARITY_BLOCK_ROWS):
+        end = min(size, start + SIMILARITY_BLOCK_ROWS)
+        ranks[start:end] = counts[start:end] / np.outer(extents[start:end], extents)
+    return ranks
+
+
+def window_extents(size: int, radius: int) -> np.ndarray:
+    positions = np.arange(size)
+    return np.minimum(size, positions + radius + 1) - np.maximum(0, positions - radius)
+
+
+def local_rank_matrix_loop(similarities: np.ndarray, radius: int) -> np.ndarray:
     size = similarities.shape[0]
     ranks = np.empty_like(similarities, dtype=np.float32)
     for row in range(size):
@@ -182,41 +489,118 @@ def local_rank_matrix(similarities: np.ndarray, radius: int) -> np.ndarray:
     return ranks
 
 
-def padded_prefix_sum(matrix: np.ndarray) -> np.ndarray:
-    prefix = matrix.cumsum(axis=0).cumsum(axis=1)
-    return np.pad(prefix, ((1, 0), (1, 0)), mode="constant")
+def rank_band_width(boundary_window: int) -> int:
+    return max(2 * boundary_window - 1, 0)
 
 
-def block_sum(
-    prefix: np.ndarray,
-    row_start: int,
-    row_end: int,
-    col_start: int,
-    col_end: int,
-) -> float:
-    return float(
-        prefix[row_end, col_end]
-        - prefix[row_start, col_end]
-        - prefix[row_end, col_start]
-        + prefix[row_start, col_start]
+def banded_similarities(
+    embeddings: np.ndarray,
+    band_width: int,
+    block_rows: int = SIMILARITY_BLOCK_ROWS,
+) -> np.ndarray:
+    size = len(embeddings)
+    offsets = np.arange(-band_width, band_width + 1)
+    band = np.full((size, len(offsets)), np.nan, dtype=np.float32)
+    for start in range(0, size, block_rows):
+        end = min(size, start + block_rows)
+        column_start = max(0, start - band_width)
+        column_end = min(size, end + band_width)
+        block = np.asarray(
+            embeddings[start:end] @ embeddings[column_start:column_end].T,
+            dtype=np.float32,
+        )
+        rows = np.arange(start, end)[:, None]
+        columns = rows + offsets
+        valid = (columns >= 0) & (columns < size)
+        block_rows_index = np.broadcast_to(rows - start, columns.shape)
+        band[start:end][valid] = block[block_rows_index[valid], columns[valid] - column_start]
+    return band
+
+
+def banded_local_rank_matrix(
+    similarity_band: np.ndarray,
+    radius: int,
+    band_width: int,
+) -> np.ndarray:
+    size, similarity_columns = similarity_band.shape
+    similarity_width = (similarity_columns - 1) // 2
+    if similarity_width < band_width + 2 * radius:
+        raise ValueError("Similarity band is too narrow for the requested rank band.")
+
+    columns = 2 * band_width + 1
+    first = similarity_width - band_width
+    centers = similarity_band[:, first : first + columns]
+    padded = np.pad(
+        similarity_band,
+        ((radius, radius), (0, 0)),
+        mode="constant",
+        constant_values=np.nan,
+    )
+    counts = np.zeros(centers.shape, dtype=np.int32)
+    for row in range(-radius, radius + 1):
+        for column in range(-radius, radius + 1):
+            start = first + column - row
+            neighbours = padded[row + radius : row + radius + size, start : start + columns]
+            counts += neighbours <= centers
+
+    extents = window_extents(size, radius)
+    positions = np.arange(size)[:, None] + np.arange(-band_width, band_width + 1)
+    column_extents = extents[np.clip(positions, 0, size - 1)]
+    ranks = counts / (extents[:, None] * column_extents)
+    ranks[(positions < 0) | (positions >= size)] = 0.0
+    return ranks.astype(np.float32)
+
+
+def padded_row_prefix_sum(band: np.ndarray) -> np.ndarray:
+    prefix = band.cumsum(axis=1, dtype=np.float64)
+    return np.pad(prefix, ((0, 0), (1, 0)), mode="constant")
+
+
+def banded_block_sums(
+    row_prefix: np.ndarray,
+    row_starts: np.ndarray,
+    row_ends: np.ndarray,
+    col_starts: np.ndarray,
+    col_ends: np.ndarray,
+) -> np.ndarray:
+    band_width = (row_prefix.shape[1] - 2) // 2
+    row_counts = row_ends - row_starts
+    rows = row_starts[:, None] + np.arange(max(int(row_counts.max(initial=0)), 1))
+    valid = rows < row_ends[:, None]
+    rows = np.where(valid, rows, row_starts[:, None])
+    row_sums = (
+        row_prefix[rows, col_ends[:, None] - rows + band_width]
+        - row_prefix[rows, col_starts[:, None] - rows + band_width]
     )
+    return np.where(valid, row_sums, 0.0).sum(axis=1)
 
 
-def block_mean(
-    prefix: np.ndarray,
-    row_start: int,
-    row_end: int,
-    col_start: int,
-    col_end: int,
-) -> float:
-    area = (row_end - row_start) * (col_end - col_start)
-    if area <= 0:
-        return 0.0
-    return block_sum(prefix, row_start, row_end, col_start, col_end) / area
+def banded_block_means(
+    row_prefix: np.ndarray,
+    row_starts: np.ndarray,
+    row_ends: np.ndarray,
+    col_starts: np.ndarray,
+    col_ends: np.ndarray,
+) -> np.ndarray:
+    sums = banded_block_sums(row_prefix, row_starts, row_ends, col_starts, col_ends)
+    return divide_by_area(sums, row_starts, row_ends, col_starts, col_ends)
+
+
+def divide_by_area(
+    sums: np.ndarray,
+    row_starts: np.ndarray,
+    row_ends: np.ndarray,
+    col_starts: np.ndarray,
+    col_ends: np.ndarray,
+) -> np.ndarray:
+    areas = (row_ends - row_starts) * (col_ends - col_starts)
+    means = np.zeros(len(sums), dtype=np.float64)
+    np.divide(sums, areas, out=means, where=areas > 0)
+    return means
 
 
 def select_ranked_boundaries(
-    boundary_scores: dict[int, float],
+    boundary_scores: dict[int, float] | np.ndarray,
     segment_count: int,
     min_segments: int,
     max_boundaries: int,
@@ -225,18 +609,22 @@ def select_ranked_boundaries(
     if max_boundaries < 1:
         return []
 
-    ranked = sorted(boundary_scores.items(), key=lambda item: item[1], reverse=True)
-    if not ranked:
+    gaps, scores = boundary_score_items(boundary_scores)
+    if not len(gaps):
         return []
 
+    order = np.argsort(-scores, kind="stable")
+    ranked_gaps = gaps[order]
+    denominator = max(len(ranked_gaps) - 1, 1)
+    rank_ratios = 1.0 - (np.arange(len(ranked_gaps)) / denominator)
+    eligible = (
+        (rank_ratios >= rank_threshold)
+        & (ranked_gaps >= min_segments)
+        & (segment_count - ranked_gaps >= min_segments)
+    )
+
     selected: list[int] = []
-    denominator = max(len(ranked) - 1, 1)
-    for rank, (gap, _) in enumerate(ranked):
-        rank_ratio = 1.0 - (rank / denominator)
-        if rank_ratio < rank_threshold:
-            continue
-        if gap < min_segments or segment_count - gap < min_segments:
-            continue
+    for gap in ranked_gaps[eligible].tolist():
         if any(abs(gap - selected_gap) < min_segments for selected_gap in selected):
             continue
 
@@ -247,10 +635,32 @@ def select_ranked_boundaries(
     return sorted(selected)
 
 
+def boundary_score_items(
+    boundary_scores: dict[int, float] | np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    if isinstance(boundary_scores, dict):
+        gaps = np.fromiter(boundary_scores.keys(), dtype=np.int64, count=len(boundary_scores))
+        scores = np.fromiter(boundary_scores.values(), dtype=np.float64, count=len(boundary_scores))
+        return gaps, scores
+    scores = np.asarray(boundary_scores, dtype=np.float64)
+    return np.arange(1, len(scores) + 1), scores
+
+
+def boundary_score_at(
+    boundary_scores: dict[int, float] | np.ndarray,
+    gap: int,
+) -> float | None:
+    if isinstance(boundary_scores, dict):
+        return boundary_scores.get(gap)
+    if 1 <= gap <= len(boundary_scores):
+        return float(boundary_scores[gap - 1])
+    return None
+
+
 def build_chapters_from_boundaries(
-    segments: list[Segment],
+    segments: Sequence[Segment],
     boundaries: list[int],
-    boundary_scores: dict[int, float],
+    boundary_scores: dict[int, float] | np.ndarray,
 ) -> list[Chapter]:
     starts = [0] + boundaries
     ends = boundaries + [len(segments)]
@@ -260,7 +670,7 @@ def build_chapters_from_boundaries(
             Chapter(
                 start_at=segments[start].start_at,
                 segments=segments[start:end],
-                boundary_score=boundary_scores.get(start) if start else None,
+                boundary_score=boundary_score_at(boundary_scores, start) if start else None,
             )
         )
     return chapters
@@ -270,7 +680,15 @@ def add_representative_keywords(
     chapters: list[Chapter],
     keyword_count: int = REPRESENTATIVE_KEYWORD_COUNT,
 ) -> None:
-    chapter_tokens = [tokenize_keywords(chapter.text) for chapter in chapters]
+    segment_tokens = segment_keyword_tokens(
+        [text for chapter in chapters for text in segment_texts(chapter.segments)]
+    )
+    chapter_tokens = []
+    start = 0
+    for chapter in chapters:
+        end = start + len(chapter.segments)
+        chapter_tokens.append([token for tokens in segment_tokens[start:end] for token in tokens])
+        start = end
     document_frequency = Counter(
         token for tokens in chapter_tokens for token in set(tokens)
     )
@@ -286,75 +704,126 @@ def add_representative_keywords(
         chapter.representative_keywords = keywords
 
 
-def add_representative_texts(chapters: list[Chapter]) -> None:
-    for chapter in chapters:
-        keywords = chapter.representative_keywords or []
-        chapter.representative_text = select_representative_segment(
-            chapter.segments,
-            keywords,
+def add_representative_texts(
+    chapters: list[Chapter],
+    executor: Executor | None = None,
+) -> None:
+    jobs = [(chapter.segments, chapter.representative_keywords or []) for chapter in chapters]
+    if executor is None or len(jobs) < 2:
+        texts = [select_representative_segment(segments, keywords) for segments, keywords in jobs]
+    else:
+        # Workers get plain segment lists rather than store views, which would pickle the
+        # whole transcript buffer once per chapter. `map` keeps the chapter order.
+        texts = executor.map(
+            representative_text_job,
+            [(list(segments), keywords) for segments, keywords in jobs],
         )
+    for chapter, text in zip(chapters, texts):
+        chapter.representative_text = text
+
+
+def representative_text_job(job: tuple[list[Segment], list[str]]) -> str:
+    return select_representative_segment(*job)
 
 
 def select_representative_segment(
-    segments: list[Segment],
+    segments: Sequence[Segment],
     keywords: list[str],
     target_chars: int = REPRESENTATIVE_TARGET_CHARS,
 ) -> str:
     if not segments:
         return ""
 
-    scored: list[tuple[float, int, str]] = []
-    for start_index, candidate in representative_candidates(segments, target_chars * 2):
-        keyword_hits = keyword_hit_counts(candidate, keywords)
-        total_hits = sum(keyword_hits)
-        unique_hits = sum(1 for hits in keyword_hits if hits > 0)
-        length_score = min(len(candidate), target_chars) / target_chars
-        score = (unique_hits * 3.0) + total_hits + length_score
-        scored.append((score, -start_index, candidate))
-
-    best_text = max(scored, key=lambda item: item[:2])[2]
-    return best_keyword_window(best_text, keywords, target_chars)
+    # Candidates are offset ranges into one chapter text that is scanned for keywords
+    # once; only the winning candidate is ever sliced out as a string.
+    text, segment_starts, segment_ends = segment_buffer(segments)
+    candidates = representative_candidates(segment_starts, segment_ends, target_chars * 2)
+    matcher = KeywordMatcher(keywords)
+    keyword_hits = range_hit_counts(
+        matcher.find(text),
+        len(keywords),
+        np.array([start for _, start, _ in candidates], dtype=np.int64),
+        np.array([end for _, _, end in candidates], dtype=np.int64),
+    )
+    unique_hits = (keyword_hits > 0).sum(axis=1).tolist()
+    total_hits = keyword_hits.sum(axis=1).tolist()
+
+    scored: list[tuple[float, int, int, int]] = []
+    for (start_index, start, end), unique, total in zip(candidates, unique_hits, total_hits):
+        length_score = min(end - start, target_chars) / target_chars
+        score = (unique * 3.0) + total + length_score
+        scored.append((score, -start_index, start, end))
+
+    _, _, best_start, best_end = max(scored, key=lambda item: item[:2])
+    return best_keyword_window(text[best_start:best_end], keywords, target_chars, matcher)
+
+
+def segment_buffer(segments: Sequence[Segment]) -> tuple[str, list[int], list[int]]:
+    # The chapter text plus each segment's [start, end) offsets in it. Store views
+    # already hold the text joined with single spaces, so nothing is copied for them.
+    if isinstance(segments, SegmentStore):
+        base = int(segments.text_starts[0]) if len(segments) else 0
+        return (
+            segments.text,
+            (segments.text_starts - base).tolist(),
+            (segments.text_ends - base).tolist(),
+        )
+    texts = list(segment_texts(segments))
+    starts = []
+    ends = []
+    position = 0
+    for text in texts:
+        starts.append(position)
+        ends.append(position + len(text))
+        position += len(text) + 1
+    return " ".join(texts), starts, ends
 
 
 def representative_candidates(
-    segments: list[Segment],
+    segment_starts: list[int],
+    segment_ends: list[int],
     max_chars: int,
     max_segments: int = 3,
-) -> list[tuple[int, str]]:
+) -> list[tuple[int, int, int]]:
+    # `(first segment, start offset, end offset)` for runs of up to `max_segments`
+    # segments; a run stops growing once it is longer than `max_chars`.
     candidates = []
-    for start in range(len(segments)):
-        parts = []
-        for end in range(start, min(len(segments), start + max_segments)):
-            parts.append(segments[end].text)
-            candidate = " ".join(parts)
-            if len(candidate) > max_chars and end > start:
+    segment_count = len(segment_starts)
+    for start in range(segment_count):
+        for end in range(start, min(segment_count, start + max_segments)):
+            length = segment_ends[end] - segment_starts[start]
+            if length > max_chars and end > start:
                 break
-            candidates.append((start, candidate))
+            candidates.append((start, segment_starts[start], segment_ends[end]))
     return candidates
 
 
 def keyword_hit_counts(text: str, keywords: list[str]) -> list[int]:
-    return [
-        len(re.findall(re.escape(keyword), text, re.IGNORECASE))
-        for keyword in keywords
-    ]
+    return KeywordMatcher(keywords).hit_counts(text)
 
 
-def best_keyword_window(text: str, keywords: list[str], target_chars: int) -> str:
+def best_keyword_window(
+    text: str,
+    keywords: list[str],
+    target_chars: int,
+    matcher: KeywordMatcher | None = None,
+) -> str:
     text = re.sub(r"\s+", " ", text).strip()
     if len(text) <= target_chars:
         return text
     if not keywords:
         return shorten_text(text, target_chars)
 
+    matcher = matcher or KeywordMatcher(keywords)
+    matches = matcher.find(text)
     best_score = -1
     best_start = 0
-    last_start = max(0, len(text) - target_chars)
-    for start in range(last_start + 1):
-        window = text[start : start + target_chars]
-        keyword_hits = keyword_hit_counts(window, keywords)
-        unique_hits = sum(1 for hits in keyword_hits if hits > 0)
-        total_hits = sum(keyword_hits)
+    for start, unique_hits, total_hits in sliding_window_hits(
+        matches,
+        len(keywords),
+        len(text),
+        target_chars,
+    ):
         score = (unique_hits * 3) + total_hits
         if score > best_score:
             best_score = score
@@ -433,26 +902,44 @@ def shorten_text(text: str, max_chars: int) -> str:
     return f"{shortened}..."
 
 
+SEGMENT_TOKEN_CACHE: OrderedDict[str, list[str]] = OrderedDict()
+
+
 def tokenize_keywords(text: str) -> list[str]:
-    kiwi = get_kiwi()
-    tokens = []
-    for token in kiwi.tokenize(text):
+    return filter_keyword_tokens(get_kiwi().tokenize(text))
+
+
+def segment_keyword_tokens(texts: list[str]) -> list[list[str]]:
+    # Each distinct segment text is tokenized once per process; Kiwi spreads the
+    # missing texts of one call across its worker threads.
+    missing = list(dict.fromkeys(text for text in texts if text not in SEGMENT_TOKEN_CACHE))
+    if missing:
+        for text, tokens in zip(missing, get_kiwi().tokenize(missing)):
+            SEGMENT_TOKEN_CACHE[text] = filter_keyword_tokens(tokens)
+
+    segment_tokens = []
+    for text in texts:
+        SEGMENT_TOKEN_CACHE.move_to_end(text)
+        segment_tokens.append(SEGMENT_TOKEN_CACHE[text])
+    while len(SEGMENT_TOKEN_CACHE) > SEGMENT_TOKEN_CACHE_SIZE:
+        SEGMENT_TOKEN_CACHE.popitem(last=False)
+    return segment_tokens
+
+
+def filter_keyword_tokens(tokens: Iterable[Any]) -> list[str]:
+    keywords = []
+    for token in tokens:
         if token.tag not in KEYWORD_POS_TAGS:
             continue
         keyword = normalize_keyword(token.form)
         if is_keyword_candidate(keyword):
-            tokens.append(keyword)
-    return tokens
+            keywords.append(keyword)
+    return keywords
 
 
 @lru_cache(maxsize=1)
 def get_kiwi() -> Kiwi:
-    return Kiwi()
-
-
-def normalize_keyword(token: str) -> str:
-    token = token.lower() if re.search(r"[A-Za-z]", token) else token
-    return token.strip()
+    return Kiwi(num_workers=KIWI_NUM_WORKERS)
 
 
 def is_keyword_candidate(token: str) -> bool:
@@ -508,46 +995,236 @@ def default_output_paths(transcript_path: Path, output_dir: Path) -> tuple[Path,
     return output_dir / f"{stem}.chapters.json", output_dir / f"{stem}.chapters.md"
 
 
+def default_profile_path(json_path: Path) -> Path:
+    return json_path.with_name(json_path.name.replace(".chapters.json", ".profile.json"))
+
+
+def expand_transcript_paths(inputs: list[str]) -> list[Path]:
+    paths: list[Path] = []
+    for item in inputs:
+        path = Path(item).expanduser()
+        if path.is_dir():
+            paths.extend(sorted(path.glob(TRANSCRIPT_GLOB)))
+        elif any(character in item for character in "*?["):
+            paths.extend(sorted(Path(match) for match in glob.glob(str(path), recursive=True)))
+        else:
+            paths.append(path)
+    return [path.resolve() for path in paths]
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Create timestamped chapters from an RTZR transcript."
+        description="Create timestamped chapters from RTZR transcripts."
+    )
+    parser.add_argument(
+        "transcripts",
+        nargs="*",
+        help=f"RTZR transcript JSON files, directories of {TRANSCRIPT_GLOB} files, or glob patterns.",
+    )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Keep the embedding model loaded and read transcript paths from stdin, one per line.",
     )
-    parser.add_argument("transcript", type=Path, help="Path to RTZR transcript JSON.")
     parser.add_argument("--output-dir", type=Path, default=Path("data/outputs"))
-    return parser.parse_args()
-
-
-def main() -> None:
-    args = parse_args()
-    transcript_path = args.transcript.expanduser().resolve()
-    segments = load_segments(transcript_path)
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write per-stage wall time, CPU time and peak memory to <stem>.profile.json.",
+    )
+    parser.add_argument(
+        "--keyword-index",
+        type=Path,
+        help="Add each transcript's chapter keywords to this index for keyword_index.py query.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=REPRESENTATIVE_WORKERS,
+        help="Processes for representative text selection. 0 uses every CPU core.",
+    )
+    parser.add_argument(
+        "--rank-engine",
+        choices=RANK_ENGINES,
+        default=RANK_ENGINE,
+        help="C99 local rank implementation. 'loop' is the slow reference engine.",
+    )
+    parser.add_argument(
+        "--similarity",
+        choices=SIMILARITY_MODES,
+        default=SIMILARITY_MODE,
+        help="Store the full similarity matrix or only the diagonal band read by the boundary scores.",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=PRECISIONS,
+        default=PRECISION,
+        help="Store cached embeddings and the dense similarity and rank matrices in reduced precision.",
+    )
+    parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default=EMBEDDING_BACKEND,
+        help="'onnx' exports an int8 ONNX model once; 'auto' uses that export when it exists.",
+    )
+    parser.add_argument(
+        "--embedding-threads",
+        type=int,
+        help="Intra-op CPU threads for the embedding model. Defaults to the runtime's choice.",
+    )
+    parser.add_argument(
+        "--embedding-cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Where to keep segment embeddings between runs.",
+    )
+    parser.add_argument(
+        "--embedding-cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_MB,
+        help="Evict least recently used embeddings above this cache size.",
+    )
+    parser.add_argument(
+        "--no-embedding-cache",
+        dest="embedding_cache",
+        action="store_false",
+        help="Always encode every segment with the embedding model.",
+    )
+    args = parser.parse_args()
+    if not args.transcripts and not args.stdin:
+        parser.error("pass at least one transcript path or use --stdin")
+    if args.similarity == "banded" and args.rank_engine != "vectorized":
+        parser.error("--similarity banded only supports --rank-engine vectorized")
+    if args.similarity == "banded" and args.precision != "float32":
+        parser.error("--precision float16/int8 cannot be combined with --similarity banded")
+    return args
+
+
+def chapterize_transcript(
+    transcript_path: Path,
+    args: argparse.Namespace,
+    cache: EmbeddingCache | None = None,
+    executor: Executor | None = None,
+    keyword_index: KeywordIndex | None = None,
+) -> tuple[Path, Path]:
+    with profile_stage("load_segments"):
+        segments = load_segments(transcript_path)
+    record_count("segments", len(segments))
     embeddings = encode_segments(
         segments,
         EMBEDDING_MODEL,
-        batch_size=EMBEDDING_BATCH_SIZE,
+        cache=cache,
+        backend=args.embedding_backend,
+        threads=args.embedding_threads,
     )
     chapters = split_into_chapters_c99(
         segments,
         embeddings,
+        rank_engine=args.rank_engine,
+        similarity_mode=args.similarity,
+        precision=args.precision,
     )
-    add_representative_keywords(chapters)
-    add_representative_texts(chapters)
+    record_count("chapters", len(chapters))
+    with profile_stage("keywords"):
+        add_representative_keywords(chapters)
+    with profile_stage("representative_text"):
+        add_representative_texts(chapters, executor)
+
+    with profile_stage("write_outputs"):
+        rendered = [render_chapter(chapter, index) for index, chapter in enumerate(chapters, 1)]
+
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+        json_path, md_path = default_output_paths(transcript_path, args.output_dir)
+        json_path.write_text(
+            json.dumps(rendered, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        md_path.write_text(
+            render_markdown(rendered, transcript_path.stem.replace(".transcript", "")),
+            encoding="utf-8",
+        )
+    if keyword_index is not None:
+        with profile_stage("keyword_index"):
+            keyword_index.update(
+                json_path,
+                rendered,
+                [chapter.representative_keywords or [] for chapter in chapters],
+            )
+    return json_path, md_path
 
-    rendered = [render_chapter(chapter, index) for index, chapter in enumerate(chapters, 1)]
 
-    args.output_dir.mkdir(parents=True, exist_ok=True)
-    json_path, md_path = default_output_paths(transcript_path, args.output_dir)
-    json_path.write_text(
-        json.dumps(rendered, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    md_path.write_text(
-        render_markdown(rendered, transcript_path.stem.replace(".transcript", "")),
-        encoding="utf-8",
-    )
+def iter_stdin_paths() -> Iterator[Path]:
+    for line in sys.stdin:
+        line = line.strip()
+        if line:
+            yield Path(line).expanduser().resolve()
+
 
-    print(f"saved={json_path}")
-    print(f"saved={md_path}")
+def main() -> None:
+    args = parse_args()
+    args.embedding_backend = resolve_embedding_backend(EMBEDDING_MODEL, args.embedding_backend)
+    print(f"embedding_backend={args.embedding_backend}")
+    cache = None
+    if args.embedding_cache:
+        cache = EmbeddingCache(
+            embedding_cache_name(EMBEDDING_MODEL, args.embedding_backend),
+            cache_dir=args.embedding_cache_dir,
+            max_mb=args.embedding_cache_max_mb,
+            dtype=args.precision,
+        )
+
+    if args.stdin:
+        get_embedding_model(EMBEDDING_MODEL, args.embedding_backend, args.embedding_threads)
+        tokenize_keywords("모델 준비")
+        print("ready", flush=True)
+        transcript_paths: Iterable[Path] = iter_stdin_paths()
+    else:
+        transcript_paths = expand_transcript_paths(args.transcripts)
+        if not transcript_paths:
+            raise FileNotFoundError(f"No transcripts matched: {' '.join(args.transcripts)}")
+
+    keyword_index = KeywordIndex(args.keyword_index) if args.keyword_index else None
+
+    # One pool serves every transcript in the batch, so worker start-up is paid once.
+    workers = args.workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    failures = 0
+    single = not args.stdin and len(transcript_paths) == 1
+    try:
+        for transcript_path in transcript_paths:
+            started_at = time.perf_counter()
+            profiler = StageProfiler() if args.profile else None
+            try:
+                with profiler or nullcontext():
+                    json_path, md_path = chapterize_transcript(
+                        transcript_path, args, cache, executor, keyword_index
+                    )
+                if profiler is not None:
+                    profile_path = default_profile_path(json_path)
+                    profiler.write(profile_path, transcript=str(transcript_path))
+            except Exception as exc:
+                if single:
+                    raise
+                failures += 1
+                print(f"failed={transcript_path} error={exc!r}", flush=True)
+                continue
+
+            print(f"saved={json_path}")
+            print(f"saved={md_path}")
+            if profiler is not None:
+                print(f"saved={profile_path}")
+            print(f"elapsed_sec={time.perf_counter() - started_at:.2f}", flush=True)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if keyword_index is not None:
+            keyword_index.close()
+        if cache is not None:
+            cache.close()
+
+    if failures:
+        raise SystemExit(f"{failures} transcript(s) failed")
 
 
 if __name__ == "__main__":
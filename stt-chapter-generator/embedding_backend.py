@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import platform
+from pathlib import Path
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from embedding_cache import model_slug
+
+
+DEFAULT_EXPORT_DIR = Path("data/cache/onnx")
+EMBEDDING_BACKENDS = ("auto", "torch", "onnx")
+ONNX_MIN_COSINE = 0.98
+VERIFICATION_FILE = "verification.json"
+VERIFICATION_TEXTS = [
+    "회의를 시작하겠습니다.",
+    "이번 분기 예산 집행 현황을 먼저 공유드리겠습니다.",
+    "서버 배포 이후에 장애 알림이 두 번 발생했습니다.",
+    "전시 관람 동선은 입구에서 오른쪽으로 이어집니다.",
+    "네",
+    "The quarterly report is due next Friday.",
+    "고객 문의가 늘어서 응대 인력을 추가로 배치할 예정입니다.",
+    "정리하면 다음 회의까지 각 팀이 일정을 다시 확인해 주시면 됩니다.",
+]
+
+
+class EmbeddingBackendError(RuntimeError):
+    pass
+
+
+def onnx_quantization_config() -> str:
+    machine = platform.machine().lower()
+    return "arm64" if machine in ("arm64", "aarch64") else "avx2"
+
+
+def onnx_export_dir(model_name: str, export_dir: Path = DEFAULT_EXPORT_DIR) -> Path:
+    return Path(export_dir) / model_slug(model_name)
+
+
+def onnx_file_name() -> str:
+    return f"onnx/model_qint8_{onnx_quantization_config()}.onnx"
+
+
+def onnx_runtime_available() -> bool:
+    return all(importlib.util.find_spec(name) for name in ("onnxruntime", "optimum"))
+
+
+def has_verified_onnx_export(model_name: str, export_dir: Path = DEFAULT_EXPORT_DIR) -> bool:
+    directory = onnx_export_dir(model_name, export_dir)
+    verification_path = directory / VERIFICATION_FILE
+    if not (directory / onnx_file_name()).exists() or not verification_path.exists():
+        return False
+    verification = json.loads(verification_path.read_text(encoding="utf-8"))
+    return verification.get("file_name") == onnx_file_name() and verification.get("passed", False)
+
+
+def resolve_embedding_backend(
+    model_name: str,
+    backend: str,
+    export_dir: Path = DEFAULT_EXPORT_DIR,
+) -> str:
+    # `auto` picks up an export made earlier with `onnx`, but never exports by itself.
+    if backend == "auto":
+        usable = onnx_runtime_available() and has_verified_onnx_export(model_name, export_dir)
+        return "onnx" if usable else "torch"
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    return backend
+
+
+def embedding_cache_name(model_name: str, backend: str) -> str:
+    # Quantized ONNX vectors differ slightly from the reference, so they are cached apart.
+    if backend == "onnx":
+        return f"{model_name}@onnx-qint8-{onnx_quantization_config()}"
+    return model_name
+
+
+def load_onnx_model(
+    model_name: str,
+    threads: int | None = None,
+    export_dir: Path = DEFAULT_EXPORT_DIR,
+) -> SentenceTransformer:
+    if not onnx_runtime_available():
+        raise EmbeddingBackendError(
+            "The ONNX embedding backend needs ONNX Runtime and Optimum. "
+            'Run with `uv run --with "sentence-transformers[onnx]"` or use `--embedding-backend torch`.'
+        )
+    directory = onnx_export_dir(model_name, export_dir)
+    if not has_verified_onnx_export(model_name, export_dir):
+        export_quantized_onnx_model(model_name, directory)
+    return open_onnx_model(directory, threads)
+
+
+def export_quantized_onnx_model(model_name: str, directory: Path) -> None:
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    directory.mkdir(parents=True, exist_ok=True)
+    exported = SentenceTransformer(model_name, backend="onnx")
+    exported.save_pretrained(str(directory))
+    export_dynamic_quantized_onnx_model(
+        exported,
+        quantization_config=onnx_quantization_config(),
+        model_name_or_path=str(directory),
+    )
+
+    min_cosine = min_cosine_similarity(
+        SentenceTransformer(model_name),
+        open_onnx_model(directory),
+        VERIFICATION_TEXTS,
+    )
+    passed = min_cosine >= ONNX_MIN_COSINE
+    (directory / VERIFICATION_FILE).write_text(
+        json.dumps(
+            {
+                "file_name": onnx_file_name(),
+                "min_cosine": min_cosine,
+                "tolerance": ONNX_MIN_COSINE,
+                "passed": passed,
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    if not passed:
+        raise EmbeddingBackendError(
+            f"Quantized ONNX embeddings drift from the reference model (min cosine "
+            f"{min_cosine:.4f} < {ONNX_MIN_COSINE}). Use `--embedding-backend torch`."
+        )
+
+
+def open_onnx_model(directory: Path, threads: int | None = None) -> SentenceTransformer:
+    import onnxruntime
+
+    session_options = onnxruntime.SessionOptions()
+    if threads is not None:
+        session_options.intra_op_num_threads = threads
+        session_options.inter_op_num_threads = 1
+    return SentenceTransformer(
+        str(directory),
+        backend="onnx",
+        model_kwargs={
+            "file_name": onnx_file_name(),
+            "provider": "CPUExecutionProvider",
+            "session_options": session_options,
+        },
+    )
+
+
+def min_cosine_similarity(
+    reference: SentenceTransformer,
+    candidate: SentenceTransformer,
+    texts: list[str],
+) -> float:
+    options = dict(convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+    expected = np.asarray(reference.encode(texts, **options), dtype=np.float32)
+    actual = np.asarray(candidate.encode(texts, **options), dtype=np.float32)
+    return float(np.sum(expected * actual, axis=1).min())
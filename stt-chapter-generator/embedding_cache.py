@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+DEFAULT_CACHE_DIR = Path("data/cache/embeddings")
+DEFAULT_MAX_MB = 1024
+INITIAL_CAPACITY = 1024
+STORAGE_DTYPES = ("float32", "float16", "int8")
+INT8_MAX = 127
+
+
+class EmbeddingCache:
+    """On-disk embedding cache keyed by model name and normalized text hash.
+
+    Vectors are stored in a memory-mapped `.npy` file per model. A SQLite index maps
+    each text hash to its row and tracks last use for LRU eviction. With `float16` or
+    `int8` storage the file is two or four times smaller; `int8` rows keep a float32
+    scale per vector in a second `.npy` file and are dequantized on read.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str | Path = DEFAULT_CACHE_DIR,
+        max_mb: float = DEFAULT_MAX_MB,
+        dtype: str = "float32",
+    ) -> None:
+        if dtype not in STORAGE_DTYPES:
+            raise ValueError(f"Unknown embedding cache dtype: {dtype}")
+        self.model_name = model_name
+        self.dtype = dtype
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        slug = model_slug(model_name)
+        self.directory = Path(cache_dir) / (slug if dtype == "float32" else f"{slug}--{dtype}")
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._vectors_path = self.directory / "vectors.npy"
+        self._scales_path = self.directory / "scales.npy"
+        self._vectors: np.ndarray | None = None
+        self._scales: np.ndarray | None = None
+        self._index = sqlite3.connect(self.directory / "index.sqlite3")
+        self._index.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                slot INTEGER NOT NULL UNIQUE,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+            """
+        )
+
+    def __len__(self) -> int:
+        return self._index.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, texts: list[str]) -> list[np.ndarray | None]:
+        keys = [self.key(text) for text in texts]
+        slots = self._lookup_slots(keys)
+        vectors = self._open_vectors()
+        if not slots or vectors is None:
+            return [None] * len(texts)
+
+        now = time.time()
+        self._index.executemany(
+            "UPDATE entries SET last_used = ? WHERE key = ?",
+            [(now, key) for key in slots],
+        )
+        self._index.commit()
+
+        found: list[np.ndarray | None] = [None] * len(texts)
+        positions = [position for position, key in enumerate(keys) if key in slots]
+        row_slots = [slots[keys[position]] for position in positions]
+        scales = self._open_scales()[row_slots] if self.dtype == "int8" else None
+        rows = dequantize_vectors(vectors[row_slots], scales)
+        for position, row in zip(positions, rows):
+            found[position] = row
+        return found
+
+    def put(self, texts: list[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not texts:
+            return
+
+        pending = {}
+        for text, vector in zip(texts, vectors):
+            pending[self.key(text)] = vector
+        for key in self._lookup_slots(list(pending)):
+            pending.pop(key)
+
+        capacity = self.max_bytes // self.row_bytes(vectors.shape[1])
+        keys = list(pending)[:capacity]
+        if not keys:
+            return
+
+        slots = self._allocate_slots(len(keys), capacity)
+        storage = self._ensure_capacity(max(slots) + 1, vectors.shape[1], capacity)
+        values, scales = quantize_vectors(np.stack([pending[key] for key in keys]), self.dtype)
+        storage[slots] = values
+        storage.flush()
+        if scales is not None:
+            scale_storage = self._open_scales()
+            scale_storage[slots] = scales
+            scale_storage.flush()
+
+        now = time.time()
+        self._index.executemany(
+            "INSERT INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+            [(key, slot, now) for key, slot in zip(keys, slots)],
+        )
+        self._index.commit()
+
+    def row_bytes(self, dimension: int) -> int:
+        row_bytes = dimension * np.dtype(self.dtype).itemsize
+        if self.dtype == "int8":
+            row_bytes += np.dtype(np.float32).itemsize
+        return row_bytes
+
+    def close(self) -> None:
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        if self._scales is not None:
+            self._scales.flush()
+            self._scales = None
+        self._index.close()
+
+    def _lookup_slots(self, keys: list[str]) -> dict[str, int]:
+        slots = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._index.execute(
+                f"SELECT key, slot FROM entries WHERE key IN ({placeholders})",
+                chunk,
+            )
+            slots.update(rows)
+        return slots
+
+    def _allocate_slots(self, count: int, capacity: int) -> list[int]:
+        used = len(self)
+        next_slot = self._index.execute(
+            "SELECT COALESCE(MAX(slot) + 1, 0) FROM entries"
+        ).fetchone()[0]
+        fresh = min(count, max(capacity - used, 0))
+        slots = list(range(next_slot, next_slot + fresh))
+
+        evict = count - fresh
+        if evict:
+            rows = self._index.execute(
+                "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?",
+                (evict,),
+            ).fetchall()
+            self._index.executemany(
+                "DELETE FROM entries WHERE key = ?",
+                [(key,) for key, _ in rows],
+            )
+            slots.extend(slot for _, slot in rows)
+        return slots
+
+    def _open_vectors(self) -> np.ndarray | None:
+        if self._vectors is None and self._vectors_path.exists():
+            self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+        return self._vectors
+
+    def _open_scales(self) -> np.ndarray:
+        if self._scales is None:
+            self._scales = np.load(self._scales_path, mmap_mode="r+")
+        return self._scales
+
+    def _ensure_capacity(self, rows: int, dimension: int, capacity: int) -> np.ndarray:
+        current = self._open_vectors()
+        if current is not None and current.shape[1] != dimension:
+            raise ValueError(
+                f"Cached vectors have dimension {current.shape[1]}, got {dimension}."
+            )
+        if current is not None and current.shape[0] >= rows:
+            return current
+
+        size = max(rows, INITIAL_CAPACITY)
+        if current is not None:
+            size = max(size, current.shape[0] * 2)
+        size = min(size, max(capacity, rows))
+
+        if self.dtype == "int8":
+            self._scales = None
+            grow_npy(self._scales_path, (size,), np.float32)
+        self._vectors = None
+        del current
+        grow_npy(self._vectors_path, (size, dimension), np.dtype(self.dtype))
+        return self._open_vectors()
+
+
+def grow_npy(path: Path, shape: tuple[int, ...], dtype: np.dtype) -> None:
+    current = np.load(path, mmap_mode="r") if path.exists() else None
+    temporary_path = path.with_suffix(".tmp.npy")
+    grown = np.lib.format.open_memmap(temporary_path, mode="w+", dtype=dtype, shape=shape)
+    if current is not None:
+        grown[: current.shape[0]] = current
+        del current
+    grown.flush()
+    del grown
+    temporary_path.replace(path)
+
+
+def quantize_vectors(
+    vectors: np.ndarray,
+    dtype: str,
+) -> tuple[np.ndarray, np.ndarray | None]:
+    # int8 rows are scaled so their largest component maps to +/-127; the returned
+    # scale multiplies the int8 values back to floats.
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if dtype != "int8":
+        return vectors.astype(dtype), None
+    peaks = np.abs(vectors).max(axis=1)
+    scales = np.where(peaks > 0, peaks / INT8_MAX, 1.0).astype(np.float32)
+    values = np.rint(vectors / scales[:, None]).clip(-INT8_MAX, INT8_MAX).astype(np.int8)
+    return values, scales
+
+
+def dequantize_vectors(values: np.ndarray, scales: np.ndarray | None) -> np.ndarray:
+    vectors = values.astype(np.float32)
+    if scales is not None:
+        vectors *= scales[:, None]
+    return vectors
+
+
+def model_slug(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "--", model_name)
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+
+DEFAULT_INDEX_PATH = Path("data/index/keywords.sqlite3")
+CHAPTERS_SUFFIX = ".chapters.json"
+DEFAULT_TRANSCRIPT_DIR = Path("data/transcripts")
+SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    transcript: str
+    chapter: int
+    start_at: int
+    start: str
+    representative_text: str
+
+
+class KeywordIndex:
+    """On-disk inverted index from chapter keywords to chapters across transcripts.
+
+    Postings are `(keyword, transcript, chapter)` rows in a SQLite table clustered by
+    keyword, so a lookup reads only the rows of the queried keywords. Transcripts are
+    keyed by the resolved path of their chapter file, so same-named files in different
+    directories stay apart. Indexing a file again replaces its previous chapters, which
+    keeps the index current when a recording is re-chaptered.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_INDEX_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # Everything here is derived from the chapter files, so an older layout is
+            # rebuilt by the next `add` rather than migrated.
+            self._db.executescript(
+                """
+                DROP TABLE IF EXISTS postings;
+                DROP TABLE IF EXISTS chapters;
+                DROP TABLE IF EXISTS transcripts;
+                """
+            )
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS transcripts (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL,
+                source_mtime_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chapters (
+                transcript_id INTEGER NOT NULL,
+                number INTEGER NOT NULL,
+                start_at INTEGER NOT NULL,
+                start TEXT NOT NULL,
+                representative_text TEXT NOT NULL,
+                PRIMARY KEY (transcript_id, number)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS postings (
+                keyword TEXT NOT NULL,
+                transcript_id INTEGER NOT NULL,
+                chapter INTEGER NOT NULL,
+                PRIMARY KEY (keyword, transcript_id, chapter)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_transcript ON postings (transcript_id);
+            """
+        )
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    def is_current(self, chapters_path: Path) -> bool:
+        row = self._db.execute(
+            "SELECT source_mtime_ns FROM transcripts WHERE source = ?",
+            (transcript_source(chapters_path),),
+        ).fetchone()
+        return row is not None and row[0] == chapters_path.stat().st_mtime_ns
+
+    def update(
+        self,
+        chapters_path: Path,
+        chapters: list[dict[str, Any]],
+        keywords: list[list[str]],
+    ) -> None:
+        if len(chapters) != len(keywords):
+            raise ValueError("Every chapter needs its own keyword list.")
+        source = transcript_source(chapters_path)
+        with self._db:
+            self._remove(source)
+            transcript_id = self._db.execute(
+                "INSERT INTO transcripts (source, name, source_mtime_ns) VALUES (?, ?, ?)",
+                (source, transcript_name(chapters_path), chapters_path.stat().st_mtime_ns),
+            ).lastrowid
+            self._db.executemany(
+                "INSERT INTO chapters VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        transcript_id,
+                        chapter["number"],
+                        chapter["start_at"],
+                        chapter["start"],
+                        chapter["representative_text"],
+                    )
+                    for chapter in chapters
+                ],
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO postings VALUES (?, ?, ?)",
+                [
+                    (normalize_keyword(keyword), transcript_id, chapter["number"])
+                    for chapter, chapter_keywords in zip(chapters, keywords)
+                    for keyword in chapter_keywords
+                ],
+            )
+
+    def lookup(self, keywords: Iterable[str], match_all: bool = True) -> list[KeywordHit]:
+        keywords = sorted({normalize_keyword(keyword) for keyword in keywords} - {""})
+        if not keywords:
+            return []
+        placeholders = ",".join("?" * len(keywords))
+        required = len(keywords) if match_all else 1
+        rows = self._db.execute(
+            f"""
+            SELECT transcripts.name, chapters.number, chapters.start_at, chapters.start,
+                   chapters.representative_text
+            FROM (
+                SELECT transcript_id, chapter
+                FROM postings
+                WHERE keyword IN ({placeholders})
+                GROUP BY transcript_id, chapter
+                HAVING COUNT(*) >= ?
+            ) AS matched
+            JOIN chapters
+              ON chapters.transcript_id = matched.transcript_id
+             AND chapters.number = matched.chapter
+            JOIN transcripts ON transcripts.id = matched.transcript_id
+            ORDER BY transcripts.name, transcripts.source, chapters.number
+            """,
+            [*keywords, required],
+        )
+        return [KeywordHit(*row) for row in rows]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _remove(self, source: str) -> None:
+        row = self._db.execute("SELECT id FROM transcripts WHERE source = ?", (source,)).fetchone()
+        if row is None:
+            return
+        for table, column in (
+            ("postings", "transcript_id"),
+            ("chapters", "transcript_id"),
+            ("transcripts", "id"),
+        ):
+            self._db.execute(f"DELETE FROM {table} WHERE {column} = ?", row)
+
+
+def transcript_source(chapters_path: Path) -> str:
+    return str(chapters_path.resolve())
+
+
+def transcript_name(chapters_path: Path) -> str:
+    return chapters_path.name.removesuffix(CHAPTERS_SUFFIX)
+
+
+def normalize_keyword(token: str) -> str:
+    token = token.lower() if re.search(r"[A-Za-z]", token) else token
+    return token.strip()
+
+
+def chapter_keywords_from_json(
+    chapters: list[dict[str, Any]],
+    transcript_path: Path | None = None,
+) -> tuple[list[list[str]], bool]:
+    # `.chapters.json` keeps the chapter text but not its keywords. Keywords are rebuilt
+    # with the same per-segment Kiwi tokens and TF-IDF ranking as `chapterize.py`, from
+    # the source transcript's segments. Without a matching transcript each chapter's
+    # joined text stands in as one segment; the returned flag is False in that case.
+    from chapterize import Chapter, Segment, add_representative_keywords
+
+    rebuilt = rebuild_chapters(chapters, transcript_path) if transcript_path else None
+    exact = rebuilt is not None
+    if rebuilt is None:
+        rebuilt = [
+            Chapter(chapter["start_at"], [Segment(chapter["start_at"], chapter["text"])])
+            for chapter in chapters
+        ]
+    add_representative_keywords(rebuilt)
+    return [chapter.representative_keywords or [] for chapter in rebuilt], exact
+
+
+def rebuild_chapters(chapters: list[dict[str, Any]], transcript_path: Path) -> list | None:
+    # Chapters are consecutive runs of `segment_count` transcript segments.
+    from chapterize import Chapter, load_segments
+
+    try:
+        segments = load_segments(transcript_path)
+    except (OSError, ValueError):
+        return None
+    rebuilt = []
+    start = 0
+    for chapter in chapters:
+        end = start + chapter.get("segment_count", -1)
+        if not start < end <= len(segments) or segments[start:end].text != chapter["text"]:
+            return None
+        rebuilt.append(Chapter(chapter["start_at"], segments[start:end]))
+        start = end
+    return rebuilt if start == len(segments) else None
+
+
+def find_transcript(chapters_path: Path, transcript_dir: Path) -> Path | None:
+    name = transcript_name(chapters_path)
+    for candidate in (f"{name}.transcript.json", f"{name}.json"):
+        if (transcript_dir / candidate).is_file():
+            return transcript_dir / candidate
+    return None
+
+
+def add_chapter_files(
+    index: KeywordIndex,
+    chapters_paths: list[Path],
+    transcript_dir: Path = DEFAULT_TRANSCRIPT_DIR,
+) -> tuple[int, int, int]:
+    added = 0
+    skipped = 0
+    approximate = 0
+    for chapters_path in chapters_paths:
+        if index.is_current(chapters_path):
+            skipped += 1
+            continue
+        chapters = json.loads(chapters_path.read_text(encoding="utf-8"))
+        keywords, exact = chapter_keywords_from_json(
+            chapters, find_transcript(chapters_path, transcript_dir)
+        )
+        index.update(chapters_path, chapters, keywords)
+        added += 1
+        approximate += not exact
+    return added, skipped, approximate
+
+
+def expand_chapter_paths(inputs: list[str]) -> list[Path]:
+    paths = []
+    for value in inputs:
+        path = Path(value).expanduser()
+        if path.is_dir():
+            paths.extend(sorted(path.glob(f"*{CHAPTERS_SUFFIX}")))
+        elif path.is_file():
+            paths.append(path)
+    return [path.resolve() for path in paths]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Find chapters by keyword across every chaptered transcript."
+    )
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Index .chapters.json files that are new or changed.")
+    add.add_argument("chapters", nargs="+", help=f"{CHAPTERS_SUFFIX} files or directories.")
+    add.add_argument(
+        "--transcripts",
+        type=Path,
+        default=DEFAULT_TRANSCRIPT_DIR,
+        help="Where the source <name>.transcript.json files are, to rebuild segment keywords.",
+    )
+
+    query = commands.add_parser("query", help="List chapters whose keywords match.")
+    query.add_argument("keywords", nargs="+")
+    query.add_argument(
+        "--any",
+        dest="match_all",
+        action="store_false",
+        help="Match chapters with any of the keywords instead of all of them.",
+    )
+    query.add_argument("--limit", type=int, help="Print at most this many chapters.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    index = KeywordIndex(args.index)
+    try:
+        if args.command == "add":
+            added, skipped, approximate = add_chapter_files(
+                index, expand_chapter_paths(args.chapters), args.transcripts
+            )
+            print(
+                f"indexed={added} unchanged={skipped} without_transcript={approximate} "
+                f"transcripts={len(index)}"
+            )
+            print(f"saved={args.index}")
+            return
+
+        started_at = time.perf_counter()
+        hits = index.lookup(args.keywords, match_all=args.match_all)
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        for hit in hits[: args.limit]:
+            print(f"{hit.transcript}\t{hit.chapter}\t{hit.start}\t{hit.representative_text}")
+        print(f"matches={len(hits)} elapsed_ms={elapsed_ms:.2f}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import defaultdict, deque
+from typing import Iterator
+
+import numpy as np
+
+KeywordMatch = tuple[int, int, int]
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds every keyword occurrence in one pass.
+
+    Matching is case-insensitive. Matches are `(start, end, keyword_index)` tuples
+    sorted by start, including overlapping occurrences of the same keyword.
+    """
+
+    def __init__(self, keywords: list[str]) -> None:
+        self.keywords = list(keywords)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+        self._lengths = [len(keyword) for keyword in self.keywords]
+
+        for index, keyword in enumerate(self.keywords):
+            if keyword:
+                self._insert(fold_case(keyword), index)
+        self._link()
+
+    def find(self, text: str) -> list[KeywordMatch]:
+        matches = []
+        state = 0
+        for position, character in enumerate(fold_case(text)):
+            while state and character not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(character, 0)
+            for index in self._outputs[state]:
+                end = position + 1
+                matches.append((end - self._lengths[index], end, index))
+        matches.sort()
+        return matches
+
+    def hit_counts(self, text: str) -> list[int]:
+        return count_keyword_hits(self.find(text), len(self.keywords))
+
+    def _insert(self, keyword: str, index: int) -> None:
+        state = 0
+        for character in keyword:
+            next_state = self._goto[state].get(character)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][character] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append(index)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and character not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(character, 0)
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                )
+
+
+def count_keyword_hits(
+    matches: list[KeywordMatch],
+    keyword_count: int,
+    start: int = 0,
+    end: int | None = None,
+) -> list[int]:
+    # Mirrors `re.findall` on `text[start:end]`: per keyword, take non-overlapping
+    # occurrences from left to right that lie fully inside the range.
+    counts = [0] * keyword_count
+    last_ends = [start] * keyword_count
+    for match_start, match_end, index in matches[bisect_left(matches, (start,)) :]:
+        if end is not None and match_start >= end:
+            break
+        if end is not None and match_end > end:
+            continue
+        if match_start >= last_ends[index]:
+            counts[index] += 1
+            last_ends[index] = match_end
+    return counts
+
+
+def sliding_window_hits(
+    matches: list[KeywordMatch],
+    keyword_count: int,
+    text_length: int,
+    width: int,
+) -> Iterator[tuple[int, int, int]]:
+    """Yield `(start, unique_hits, total_hits)` for windows `[start, start + width)`.
+
+    Counts are updated incrementally as the window slides, and only starts where a
+    count changes are yielded (plus start 0), so a strict maximum over the yielded
+    scores equals a strict maximum over every start.
+    """
+    last_start = max(0, text_length - width)
+    occurrences, lengths, self_overlapping = keyword_occurrences(matches, keyword_count)
+    events: dict[int, set[int]] = defaultdict(set)
+    for match_start, match_end, index in matches:
+        enter_at = max(0, match_end - width)
+        if enter_at <= match_start and enter_at <= last_start:
+            events[enter_at].add(index)
+            if match_start + 1 <= last_start:
+                events[match_start + 1].add(index)
+
+    lows = [0] * keyword_count
+    highs = [0] * keyword_count
+    counts = [0] * keyword_count
+    unique_hits = 0
+    total_hits = 0
+    for start in [0] + sorted(position for position in events if position):
+        for index in events.get(start, ()):
+            starts = occurrences[index]
+            while lows[index] < len(starts) and starts[lows[index]] < start:
+                lows[index] += 1
+            last_fit = start + width - lengths[index]
+            while highs[index] < len(starts) and starts[highs[index]] <= last_fit:
+                highs[index] += 1
+
+            if self_overlapping[index]:
+                count = greedy_count(starts, lows[index], highs[index], lengths[index])
+            else:
+                count = max(highs[index] - lows[index], 0)
+            unique_hits += (count > 0) - (counts[index] > 0)
+            total_hits += count - counts[index]
+            counts[index] = count
+        yield start, unique_hits, total_hits
+
+
+def range_hit_counts(
+    matches: list[KeywordMatch],
+    keyword_count: int,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> np.ndarray:
+    """Count keyword hits inside each `[starts[i], ends[i])` range of one scanned text.
+
+    Returns a `(len(starts), keyword_count)` array equal to `count_keyword_hits` per range,
+    computed from the sorted match positions instead of rescanning each range.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    counts = np.zeros((len(starts), keyword_count), dtype=np.int64)
+    occurrences, lengths, self_overlapping = keyword_occurrences(matches, keyword_count)
+    for index, positions in enumerate(occurrences):
+        if not positions:
+            continue
+        sorted_positions = np.asarray(positions, dtype=np.int64)
+        lows = np.searchsorted(sorted_positions, starts, side="left")
+        highs = np.searchsorted(sorted_positions, ends - lengths[index], side="right")
+        if self_overlapping[index]:
+            counts[:, index] = [
+                greedy_count(positions, low, high, lengths[index])
+                for low, high in zip(lows.tolist(), highs.tolist())
+            ]
+        else:
+            counts[:, index] = np.maximum(highs - lows, 0)
+    return counts
+
+
+def keyword_occurrences(
+    matches: list[KeywordMatch],
+    keyword_count: int,
+) -> tuple[list[list[int]], list[int], list[bool]]:
+    # Match starts per keyword, each keyword's length, and whether any two of its
+    # occurrences overlap (only then does greedy counting differ from a plain count).
+    occurrences: list[list[int]] = [[] for _ in range(keyword_count)]
+    lengths = [0] * keyword_count
+    for match_start, match_end, index in matches:
+        occurrences[index].append(match_start)
+        lengths[index] = match_end - match_start
+    self_overlapping = [
+        any(later - earlier < lengths[index] for earlier, later in zip(starts, starts[1:]))
+        for index, starts in enumerate(occurrences)
+    ]
+    return occurrences, lengths, self_overlapping
+
+
+def greedy_count(starts: list[int], low: int, high: int, length: int) -> int:
+    count = 0
+    last_end = -1
+    for match_start in starts[low:high]:
+        if match_start >= last_end:
+            count += 1
+            last_end = match_start + length
+    return count
+
+
+def fold_case(text: str) -> str:
+    # Fold each character to exactly one character so match offsets stay valid.
+    folded = text.casefold()
+    if len(folded) == len(text):
+        return folded
+    return "".join(fold_character(character) for character in text)
+
+
+def fold_character(character: str) -> str:
+    folded = character.casefold()
+    if len(folded) == 1:
+        return folded
+    return character.lower()[0]
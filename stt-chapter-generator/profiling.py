@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+_active_profiler: StageProfiler | None = None
+
+
+@dataclass
+class StageStats:
+    calls: int = 0
+    wall_sec: float = 0.0
+    cpu_sec: float = 0.0
+    tracemalloc_peak_mb: float = 0.0
+    peak_rss_mb: float = 0.0
+
+
+class StageProfiler:
+    """Per-stage wall time, CPU time and memory for one pipeline run.
+
+    While the profiler is active, `profile_stage` blocks in the pipeline record into it.
+    Stages must not nest, because each stage resets the tracemalloc peak.
+    """
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.trace_memory = trace_memory
+        self.stages: dict[str, StageStats] = {}
+        self.counts: dict[str, int] = {}
+        self._started_tracing = False
+        self._previous: StageProfiler | None = None
+        self._started_at = 0.0
+        self._finished_at: float | None = None
+
+    def __enter__(self) -> StageProfiler:
+        global _active_profiler
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._previous = _active_profiler
+        _active_profiler = self
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        global _active_profiler
+        self._finished_at = time.perf_counter()
+        _active_profiler = self._previous
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        started_at = time.perf_counter()
+        cpu_started_at = time.process_time()
+        try:
+            yield
+        finally:
+            stats = self.stages.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.wall_sec += time.perf_counter() - started_at
+            stats.cpu_sec += time.process_time() - cpu_started_at
+            if tracing:
+                peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                stats.tracemalloc_peak_mb = max(stats.tracemalloc_peak_mb, peak_mb)
+            stats.peak_rss_mb = max(stats.peak_rss_mb, peak_rss_mb())
+
+    def count(self, name: str, value: int) -> None:
+        self.counts[name] = value
+
+    def report(self) -> dict[str, Any]:
+        finished_at = self._finished_at or time.perf_counter()
+        return {
+            "total_wall_sec": round(finished_at - self._started_at, 6),
+            "peak_rss_mb": round(peak_rss_mb(), 3),
+            "counts": dict(self.counts),
+            "stages": [
+                {
+                    "name": name,
+                    "calls": stats.calls,
+                    "wall_sec": round(stats.wall_sec, 6),
+                    "cpu_sec": round(stats.cpu_sec, 6),
+                    "tracemalloc_peak_mb": round(stats.tracemalloc_peak_mb, 3),
+                    "peak_rss_mb": round(stats.peak_rss_mb, 3),
+                }
+                for name, stats in self.stages.items()
+            ],
+        }
+
+    def write(self, path: Path, **metadata: Any) -> None:
+        payload = {**metadata, **self.report()}
+        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+@contextmanager
+def profile_stage(name: str) -> Iterator[None]:
+    if _active_profiler is None:
+        yield
+        return
+    with _active_profiler.stage(name):
+        yield
+
+
+def record_count(name: str, value: int) -> None:
+    if _active_profiler is not None:
+        _active_profiler.count(name, value)
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
@@ -1,13 +1,143 @@
 from __future__ import annotations
 
+import asyncio
+import io
 import json
 import os
+import secrets
+import tempfile
 import time
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, BinaryIO, Iterator
 
+import httpx
 from requests import Session
 
+from audio_compaction import CompactedAudio, compact_audio
+
+
+DEFAULT_BASE_URL = "https://openapi.vito.ai"
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class UploadStats:
+    bytes: int
+    seconds: float
+    # Set when the audio was compacted before the upload.
+    original_bytes: int | None = None
+    compaction_sec: float = 0.0
+
+    @property
+    def mb_per_sec(self) -> float:
+        return self.bytes / (1024 * 1024) / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def size_ratio(self) -> float:
+        return (self.original_bytes or self.bytes) / self.bytes if self.bytes else 1.0
+
+    @property
+    def time_saved_sec(self) -> float:
+        # Upload time the removed bytes would have taken at the measured rate, minus the
+        # time spent compacting.
+        if self.original_bytes is None or self.seconds <= 0:
+            return 0.0
+        skipped_bytes = self.original_bytes - self.bytes
+        return skipped_bytes * self.seconds / self.bytes - self.compaction_sec
+
+
+class MultipartFileUpload:
+    """`multipart/form-data` request body that reads the file from disk while it is sent.
+
+    Only the part headers are built up front; the file is read `chunk_bytes` at a time,
+    so client memory does not grow with the file size. The total length is known in
+    advance, which lets both clients send a `Content-Length` instead of chunked encoding.
+    """
+
+    def __init__(
+        self,
+        file_path: str | Path,
+        fields: dict[str, str],
+        file_field: str = "file",
+        chunk_bytes: int = UPLOAD_CHUNK_BYTES,
+    ) -> None:
+        self.file_path = Path(file_path)
+        self.chunk_bytes = chunk_bytes
+        boundary = secrets.token_hex(16)
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+
+        head = "".join(
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{quote_header_value(name)}"\r\n\r\n'
+            f"{value}\r\n"
+            for name, value in fields.items()
+        )
+        head += (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{quote_header_value(file_field)}"; '
+            f'filename="{quote_header_value(self.file_path.name)}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        )
+        tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+        head_bytes = head.encode("utf-8")
+        self.len = len(head_bytes) + self.file_path.stat().st_size + len(tail)
+
+        self._head = io.BytesIO(head_bytes)
+        self._tail = io.BytesIO(tail)
+        self._file: BinaryIO | None = None
+        self._sources: list[BinaryIO] | None = None
+        self._sent = 0
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+
+    def __len__(self) -> int:
+        return self.len
+
+    def read(self, size: int = -1) -> bytes:
+        if self._sources is None:
+            self._file = self.file_path.open("rb")
+            self._sources = [self._head, self._file, self._tail]
+            self._started_at = time.perf_counter()
+        size = self.chunk_bytes if size is None or size < 0 else size
+
+        chunks = []
+        remaining = size
+        while remaining and self._sources:
+            chunk = self._sources[0].read(remaining)
+            if not chunk:
+                self._sources.pop(0)
+                continue
+            chunks.append(chunk)
+            remaining -= len(chunk)
+
+        data = b"".join(chunks)
+        self._sent += len(data)
+        if not self._sources and self._finished_at is None:
+            self._finished_at = time.perf_counter()
+            self.close()
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        while chunk := self.read(self.chunk_bytes):
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        # Disk reads run in a worker thread so one upload does not stall the event loop
+        # for the poller and the other uploads.
+        while chunk := await asyncio.to_thread(self.read, self.chunk_bytes):
+            yield chunk
+
+    def stats(self) -> UploadStats:
+        started_at = self._started_at or 0.0
+        finished_at = self._finished_at or time.perf_counter()
+        return UploadStats(bytes=self._sent, seconds=finished_at - started_at)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
 
 class RTZROpenAPIClient:
     """Minimal client for RTZR OpenAPI auth and file STT."""
@@ -16,22 +146,17 @@ class RTZROpenAPIClient:
         self,
         client_id: str | None = None,
         client_secret: str | None = None,
-        base_url: str = "https://openapi.vito.ai",
+        base_url: str = DEFAULT_BASE_URL,
     ) -> None:
         self.base_url = base_url.rstrip("/")
-        self.client_id = client_id or os.getenv("RTZR_CLIENT_ID")
-        self.client_secret = client_secret or os.getenv("RTZR_CLIENT_SECRET")
-        if not self.client_id or not self.client_secret:
-            raise ValueError(
-                "Missing credentials. Set RTZR_CLIENT_ID and RTZR_CLIENT_SECRET."
-            )
+        self.client_id, self.client_secret = resolve_credentials(client_id, client_secret)
 
         self._session = Session()
         self._token: dict[str, Any] | None = None
 
     @property
     def token(self) -> str:
-        if self._token is None or self._token.get("expire_at", 0) < time.time() - 1800:
+        if token_expired(self._token):
             response = self._session.post(
                 f"{self.base_url}/v1/authenticate",
                 data={
@@ -42,22 +167,35 @@ class RTZROpenAPIClient:
             )
             response.raise_for_status()
             self._token = response.json()
+        return access_token(self._token)
 
-        access_token = self._token.get("access_token")
-        if not access_token:
-            raise RuntimeError("authenticate: 'access_token' not found in response")
-        return access_token
-
-    def transcribe_file(self, file_path: str | Path, config: dict[str, Any]) -> dict[str, Any]:
-        audio_path = Path(file_path)
-        with audio_path.open("rb") as audio_file:
-            response = self._session.post(
-                f"{self.base_url}/v1/transcribe",
-                headers={"Authorization": f"Bearer {self.token}"},
-                files={"file": (audio_path.name, audio_file)},
-                data={"config": json.dumps(config, ensure_ascii=False)},
-                timeout=60,
+    def transcribe_file(
+        self,
+        file_path: str | Path,
+        config: dict[str, Any],
+        upload_stats: list[UploadStats] | None = None,
+        compact: bool = False,
+    ) -> dict[str, Any]:
+        with tempfile.TemporaryDirectory(prefix="rtzr-upload-") as work_dir:
+            compacted = compact_audio(Path(file_path), Path(work_dir)) if compact else None
+            upload = MultipartFileUpload(
+                compacted.path if compacted else file_path,
+                {"config": json.dumps(config, ensure_ascii=False)},
             )
+            try:
+                response = self._session.post(
+                    f"{self.base_url}/v1/transcribe",
+                    headers={
+                        "Authorization": f"Bearer {self.token}",
+                        "Content-Type": upload.content_type,
+                    },
+                    data=upload,
+                    timeout=60,
+                )
+            finally:
+                upload.close()
+        if upload_stats is not None:
+            upload_stats.append(compacted_upload_stats(upload, compacted))
         response.raise_for_status()
         return response.json()
 
@@ -90,3 +228,140 @@ class RTZROpenAPIClient:
 
             print(f"status={status}; waiting {poll_interval_sec}s...")
             time.sleep(poll_interval_sec)
+
+
+class AsyncRTZROpenAPIClient:
+    """Asyncio variant of `RTZROpenAPIClient` for submitting and polling many files at once.
+
+    Every request shares one HTTP connection pool of at most `max_connections`
+    connections, and concurrent callers share a single token refresh.
+    """
+
+    def __init__(
+        self,
+        client_id: str | None = None,
+        client_secret: str | None = None,
+        base_url: str = DEFAULT_BASE_URL,
+        max_connections: int = 20,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.client_id, self.client_secret = resolve_credentials(client_id, client_secret)
+
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections),
+            timeout=30,
+        )
+        self._token: dict[str, Any] | None = None
+        self._token_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> AsyncRTZROpenAPIClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def token(self) -> str:
+        async with self._token_lock:
+            if token_expired(self._token):
+                response = await self._client.post(
+                    f"{self.base_url}/v1/authenticate",
+                    data={
+                        "client_id": self.client_id,
+                        "client_secret": self.client_secret,
+                    },
+                )
+                response.raise_for_status()
+                self._token = response.json()
+            return access_token(self._token)
+
+    async def transcribe_file(
+        self,
+        file_path: str | Path,
+        config: dict[str, Any],
+        upload_stats: list[UploadStats] | None = None,
+        compact: bool = False,
+    ) -> dict[str, Any]:
+        with tempfile.TemporaryDirectory(prefix="rtzr-upload-") as work_dir:
+            compacted = None
+            if compact:
+                # Re-encoding is CPU-bound, so it runs off the event loop.
+                compacted = await asyncio.to_thread(compact_audio, Path(file_path), Path(work_dir))
+            upload = MultipartFileUpload(
+                compacted.path if compacted else file_path,
+                {"config": json.dumps(config, ensure_ascii=False)},
+            )
+            try:
+                response = await self._client.post(
+                    f"{self.base_url}/v1/transcribe",
+                    headers={
+                        "Authorization": f"Bearer {await self.token()}",
+                        "Content-Type": upload.content_type,
+                        "Content-Length": str(len(upload)),
+                    },
+                    content=aiter(upload),
+                    timeout=60,
+                )
+            finally:
+                upload.close()
+        if upload_stats is not None:
+            upload_stats.append(compacted_upload_stats(upload, compacted))
+        response.raise_for_status()
+        return response.json()
+
+    async def get_transcription(self, transcribe_id: str) -> dict[str, Any]:
+        response = await self._client.get(
+            f"{self.base_url}/v1/transcribe/{transcribe_id}",
+            headers={"Authorization": f"Bearer {await self.token()}"},
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def resolve_credentials(
+    client_id: str | None,
+    client_secret: str | None,
+) -> tuple[str, str]:
+    client_id = client_id or os.getenv("RTZR_CLIENT_ID")
+    client_secret = client_secret or os.getenv("RTZR_CLIENT_SECRET")
+    if not client_id or not client_secret:
+        raise ValueError(
+            "Missing credentials. Set RTZR_CLIENT_ID and RTZR_CLIENT_SECRET."
+        )
+    return client_id, client_secret
+
+
+def token_expired(token: dict[str, Any] | None) -> bool:
+    return token is None or token.get("expire_at", 0) < time.time() - 1800
+
+
+def access_token(token: dict[str, Any]) -> str:
+    value = token.get("access_token")
+    if not value:
+        raise RuntimeError("authenticate: 'access_token' not found in response")
+    return value
+
+
+def compacted_upload_stats(
+    upload: MultipartFileUpload,
+    compacted: CompactedAudio | None,
+) -> UploadStats:
+    stats = upload.stats()
+    if compacted is None:
+        return stats
+    # The multipart framing is sent either way, so it counts toward the original size too.
+    framing_bytes = stats.bytes - compacted.bytes
+    return replace(
+        stats,
+        original_bytes=compacted.original_bytes + framing_bytes,
+        compaction_sec=compacted.seconds,
+    )
+
+
+def quote_header_value(value: str) -> str:
+    # HTML5 form encoding, as browsers and urllib3 send non-ASCII file names.
+    for character, escaped in (("\\", "\\\\"), ('"', "%22"), ("\r", "%0D"), ("\n", "%0A")):
+        value = value.replace(character, escaped)
+    return value
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import io
+import json
+import re
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, TextIO, overload
+
+import numpy as np
+
+
+READ_CHUNK_CHARS = 1 << 16
+SEGMENT_SEPARATOR = " "
+# Characters that can continue a JSON number, e.g. `1234.` + `5` or `1e` + `10`.
+NUMBER_TAIL = re.compile(r"[-+.0-9eE]*\Z")
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    start_at: int
+    text: str
+
+
+class SegmentStore:
+    """Columnar transcript segments.
+
+    Start times live in one int64 array and all texts in one string joined with single
+    spaces, addressed by offset arrays. Slicing returns a view over the same buffers and
+    `Segment` values are only built when a row is read, so a chapter's text is one
+    substring of the buffer instead of a join over segment objects.
+    """
+
+    __slots__ = ("start_ats", "buffer", "text_starts", "text_ends")
+
+    def __init__(
+        self,
+        start_ats: np.ndarray,
+        buffer: str,
+        text_starts: np.ndarray,
+        text_ends: np.ndarray,
+    ) -> None:
+        self.start_ats = start_ats
+        self.buffer = buffer
+        self.text_starts = text_starts
+        self.text_ends = text_ends
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Segment]) -> SegmentStore:
+        return cls.from_utterances(
+            {"start_at": segment.start_at, "msg": segment.text} for segment in segments
+        )
+
+    @classmethod
+    def from_utterances(cls, utterances: Iterable[dict[str, Any]]) -> SegmentStore:
+        start_ats = array("q")
+        lengths = array("q")
+        buffer = io.StringIO()
+        for item in utterances:
+            text = str(item.get("msg", "")).strip()
+            if not text:
+                continue
+            if start_ats:
+                buffer.write(SEGMENT_SEPARATOR)
+            buffer.write(text)
+            start_ats.append(int(item.get("start_at", 0)))
+            lengths.append(len(text))
+
+        text_lengths = np.frombuffer(lengths, dtype=np.int64) if lengths else np.empty(0, np.int64)
+        text_starts = np.zeros(len(text_lengths), dtype=np.int64)
+        np.cumsum(text_lengths[:-1] + len(SEGMENT_SEPARATOR), out=text_starts[1:])
+        return cls(
+            start_ats=np.array(start_ats, dtype=np.int64),
+            buffer=buffer.getvalue(),
+            text_starts=text_starts,
+            text_ends=text_starts + text_lengths,
+        )
+
+    def __len__(self) -> int:
+        return len(self.start_ats)
+
+    @overload
+    def __getitem__(self, index: int) -> Segment:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> SegmentStore:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Segment | SegmentStore:
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                raise ValueError("SegmentStore slices must be contiguous.")
+            return SegmentStore(
+                self.start_ats[index],
+                self.buffer,
+                self.text_starts[index],
+                self.text_ends[index],
+            )
+        return Segment(start_at=int(self.start_ats[index]), text=self.text_at(index))
+
+    def __iter__(self) -> Iterator[Segment]:
+        for start_at, text in zip(self.start_ats.tolist(), self.texts()):
+            yield Segment(start_at=start_at, text=text)
+
+    def text_at(self, index: int) -> str:
+        return self.buffer[self.text_starts[index] : self.text_ends[index]]
+
+    def texts(self) -> Iterator[str]:
+        for start, end in zip(self.text_starts.tolist(), self.text_ends.tolist()):
+            yield self.buffer[start:end]
+
+    @property
+    def text(self) -> str:
+        if not len(self):
+            return ""
+        return self.buffer[self.text_starts[0] : self.text_ends[-1]]
+
+
+def load_segment_store(transcript_path: Path) -> SegmentStore:
+    with transcript_path.open(encoding="utf-8") as file:
+        return SegmentStore.from_utterances(iter_transcript_utterances(file))
+
+
+def iter_transcript_utterances(
+    file: TextIO,
+    chunk_chars: int = READ_CHUNK_CHARS,
+) -> Iterator[dict[str, Any]]:
+    # Accepts a bare utterance list or an RTZR payload with `results.utterances`, and
+    # decodes one utterance at a time so the whole document is never held in memory.
+    reader = JsonChunkReader(file, chunk_chars)
+    opening = reader.next_char()
+    if opening == "[":
+        yield from reader.iter_array_items()
+    elif opening == "{":
+        for key in reader.iter_object_keys():
+            if key == "results" and reader.peek_char() == "{":
+                reader.next_char()
+                for results_key in reader.iter_object_keys():
+                    if results_key == "utterances" and reader.peek_char() == "[":
+                        reader.next_char()
+                        yield from reader.iter_array_items()
+                    else:
+                        reader.decode_value()
+            else:
+                reader.decode_value()
+
+
+class JsonChunkReader:
+    def __init__(self, file: TextIO, chunk_chars: int = READ_CHUNK_CHARS) -> None:
+        self._file = file
+        self._chunk_chars = chunk_chars
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def peek_char(self) -> str:
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position].isspace():
+                self._position += 1
+            if self._position < len(self._buffer) or not self._read():
+                break
+        return self._buffer[self._position : self._position + 1]
+
+    def next_char(self) -> str:
+        character = self.peek_char()
+        self._position += len(character)
+        return character
+
+    def decode_value(self) -> Any:
+        self.peek_char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._read():
+                    raise
+                continue
+            # A number split across chunks decodes as a shorter prefix, so keep reading
+            # while everything from its start to the end of the buffer could be a number.
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and NUMBER_TAIL.match(self._buffer, self._position)
+                and self._read()
+            ):
+                continue
+            self._position = end
+            return value
+
+    def iter_array_items(self) -> Iterator[Any]:
+        if self.peek_char() == "]":
+            self.next_char()
+            return
+        while True:
+            yield self.decode_value()
+            separator = self.next_char()
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {separator!r}.")
+
+    def iter_object_keys(self) -> Iterator[str]:
+        if self.peek_char() == "}":
+            self.next_char()
+            return
+        while True:
+            key = self.decode_value()
+            if self.next_char() != ":":
+                raise ValueError(f"Expected ':' after JSON key {key!r}.")
+            yield key
+            separator = self.next_char()
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' in JSON object, got {separator!r}.")
+
+    def _read(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_chars)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
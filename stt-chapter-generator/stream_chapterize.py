@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from bisect import bisect_left, insort
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from chapterize import (
+    BOUNDARY_RANK_THRESHOLD,
+    BOUNDARY_TEXT_CHARS,
+    EMBEDDING_MODEL,
+    RANK_RADIUS,
+    WINDOW_SIZE,
+    Segment,
+    c99_boundary_score_array,
+    get_embedding_model,
+    ms_to_timestamp,
+    normalize_segment_text,
+)
+
+
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+# Final lines of python-stt-sample/src/stream_stt.py: `<start sec> ~ <end sec> : <text>`.
+# Interim lines have no end time and are skipped.
+STREAM_STT_FINAL = re.compile(r"(\d+(?:\.\d+)?) ~ \d+(?:\.\d+)? : (.*)")
+
+
+@dataclass(frozen=True)
+class BoundaryEvent:
+    kind: str
+    gap: int
+    start_at: int
+    score: float
+
+
+class OnlineC99Segmenter:
+    """C99-rank boundary detection over segments that arrive one at a time.
+
+    Only the last `2 * (boundary_window + rank_radius)` embeddings are kept. Each new
+    segment recomputes the rank matrix and prefix sums of that tail, which covers every
+    gap whose score can still change, so the cost per segment does not grow with the
+    transcript. The score of gap `g` is final once `g + boundary_window + rank_radius`
+    segments have arrived and then equals the batch score.
+    """
+
+    def __init__(
+        self,
+        rank_radius: int = RANK_RADIUS,
+        boundary_window: int = WINDOW_SIZE,
+        min_segments: int = WINDOW_SIZE,
+        rank_threshold: float = BOUNDARY_RANK_THRESHOLD,
+        min_chapter_chars: int = BOUNDARY_TEXT_CHARS,
+    ) -> None:
+        self.rank_radius = rank_radius
+        self.boundary_window = boundary_window
+        self.min_segments = min_segments
+        self.rank_threshold = rank_threshold
+        self.min_chapter_chars = min_chapter_chars
+
+        self.segment_count = 0
+        self.boundaries: list[int] = []
+        self._tail: deque[np.ndarray] = deque(maxlen=2 * (boundary_window + rank_radius))
+        self._start_ats: list[int] = []
+        self._char_offsets = [0]
+        self._scores: list[float] = []
+        self._final_count = 0
+        self._ranked_scores: list[float] = []
+        self._decided_through = 0
+        self._provisional: int | None = None
+
+    @property
+    def finalization_delay(self) -> int:
+        # Segments that must follow a gap before its boundary decision is final.
+        return self.boundary_window + self.rank_radius + self.min_segments - 1
+
+    def push(self, segment: Segment, embedding: np.ndarray) -> list[BoundaryEvent]:
+        self._tail.append(np.asarray(embedding, dtype=np.float32))
+        self._start_ats.append(segment.start_at)
+        self._char_offsets.append(self._char_offsets[-1] + len(segment.text))
+        self.segment_count += 1
+        self._update_scores()
+        self._finalize_scores(self.segment_count - self.boundary_window - self.rank_radius)
+
+        events = self._decide(self.segment_count - self.finalization_delay)
+        events.extend(self._update_provisional())
+        return events
+
+    def finish(self) -> list[BoundaryEvent]:
+        self._finalize_scores(len(self._scores))
+        events = self._decide(len(self._scores))
+        if self._provisional is not None:
+            events.append(self._event("retracted", self._provisional))
+            self._provisional = None
+        return events
+
+    def _update_scores(self) -> None:
+        count = self.segment_count
+        tail_scores = c99_boundary_score_array(
+            np.stack(self._tail),
+            rank_radius=self.rank_radius,
+            boundary_window=self.boundary_window,
+        )
+        # Tail gap `i` is global gap `offset + i + 1`; only the last gaps still change.
+        offset = count - len(self._tail)
+        first_changed = max(1, count - self.boundary_window - self.rank_radius)
+        del self._scores[first_changed - 1 :]
+        self._scores.extend(tail_scores[first_changed - offset - 1 :].tolist())
+
+    def _finalize_scores(self, last_gap: int) -> None:
+        while self._final_count < min(last_gap, len(self._scores)):
+            insort(self._ranked_scores, self._scores[self._final_count])
+            self._final_count += 1
+
+    def _decide(self, last_gap: int) -> list[BoundaryEvent]:
+        events = []
+        while self._decided_through < min(last_gap, self._final_count):
+            self._decided_through += 1
+            gap = self._decided_through
+            if self._is_boundary(gap, final=True):
+                self.boundaries.append(gap)
+                events.append(self._event("final", gap))
+                if gap == self._provisional:
+                    self._provisional = None
+            elif gap == self._provisional:
+                events.append(self._event("retracted", gap))
+                self._provisional = None
+        return events
+
+    def _update_provisional(self) -> list[BoundaryEvent]:
+        pending = range(self._decided_through + 1, len(self._scores) + 1)
+        candidates = [gap for gap in pending if self._is_boundary(gap, final=False)]
+        best = max(candidates, key=lambda gap: self._scores[gap - 1], default=None)
+        if best == self._provisional:
+            return []
+
+        events = []
+        if self._provisional is not None:
+            events.append(self._event("retracted", self._provisional))
+        if best is not None:
+            events.append(self._event("provisional", best))
+        self._provisional = best
+        return events
+
+    def _is_boundary(self, gap: int, final: bool) -> bool:
+        previous = self.boundaries[-1] if self.boundaries else 0
+        if gap - previous < self.min_segments:
+            return False
+        if self._char_offsets[gap] - self._char_offsets[previous] < self.min_chapter_chars:
+            return False
+        if self.rank_ratio(self._scores[gap - 1]) < self.rank_threshold:
+            return False
+        if not final:
+            return True
+
+        if self.segment_count - gap < self.min_segments:
+            return False
+        # Ties go to the earlier gap, as in the stable sort of the batch selection.
+        score = self._scores[gap - 1]
+        before = self._scores[max(0, gap - self.min_segments) : gap - 1]
+        after = self._scores[gap : gap + self.min_segments - 1]
+        return all(score > other for other in before) and all(score >= other for other in after)
+
+    def rank_ratio(self, score: float) -> float:
+        lower = bisect_left(self._ranked_scores, score)
+        return lower / max(len(self._ranked_scores) - 1, 1)
+
+    def _event(self, kind: str, gap: int) -> BoundaryEvent:
+        return BoundaryEvent(
+            kind=kind,
+            gap=gap,
+            start_at=self._start_ats[gap],
+            score=self._scores[gap - 1],
+        )
+
+
+def embed_segment(model: SentenceTransformer, segment: Segment) -> np.ndarray:
+    vectors = model.encode(
+        [normalize_segment_text(segment.text)],
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    return np.asarray(vectors[0], dtype=np.float32)
+
+
+def stream_boundary_events(
+    segments: Iterable[Segment],
+    model_name: str = EMBEDDING_MODEL,
+    segmenter: OnlineC99Segmenter | None = None,
+) -> Iterator[BoundaryEvent]:
+    model = get_embedding_model(model_name)
+    segmenter = segmenter or OnlineC99Segmenter()
+    for segment in segments:
+        yield from segmenter.push(segment, embed_segment(model, segment))
+    yield from segmenter.finish()
+
+
+def iter_stdin_segments() -> Iterator[Segment]:
+    for line in sys.stdin:
+        segment = parse_input_line(line)
+        if segment is not None:
+            yield segment
+
+
+def parse_input_line(line: str) -> Segment | None:
+    # Accepts RTZR utterance JSON lines or the console output of stream_stt.py, which
+    # ends interim results with `\r` so only the text after the last one is final.
+    line = ANSI_ESCAPE.sub("", line).strip().rsplit("\r", 1)[-1]
+    if line.startswith("{"):
+        item = json.loads(line)
+        start_at = int(item.get("start_at", 0))
+        text = str(item.get("msg", "")).strip()
+    elif match := STREAM_STT_FINAL.fullmatch(line):
+        start_at = round(float(match[1]) * 1000)
+        text = match[2].strip()
+    else:
+        return None
+    return Segment(start_at=start_at, text=text) if text else None
+
+
+def render_event(event: BoundaryEvent) -> dict[str, Any]:
+    return {
+        "event": event.kind,
+        "gap": event.gap,
+        "start_at": event.start_at,
+        "start": ms_to_timestamp(event.start_at),
+        "boundary_score": event.score,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Detect chapter boundaries while a live transcript is still arriving. "
+            "Reads RTZR utterance JSON lines, or the output of stream_stt.py, from stdin."
+        )
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    parse_args()
+    for event in stream_boundary_events(iter_stdin_segments()):
+        print(json.dumps(render_event(event), ensure_ascii=False), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+from chapterize import (
+    BOUNDARY_RANK_THRESHOLD,
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    MAX_BOUNDARIES,
+    RANK_ENGINE,
+    RANK_ENGINES,
+    RANK_RADIUS,
+    WINDOW_SIZE,
+    Segment,
+    auto_max_boundaries,
+    boundary_scores_from_prefix,
+    default_output_paths,
+    dense_rank_band,
+    encode_segments,
+    load_segments,
+    local_rank_matrix,
+    ms_to_timestamp,
+    padded_row_prefix_sum,
+    rank_band_width,
+    select_ranked_boundaries,
+)
+from embedding_backend import EMBEDDING_BACKENDS, embedding_cache_name, resolve_embedding_backend
+from embedding_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_MB, EmbeddingCache
+
+
+SWEEP_COLUMNS = (
+    "rank_radius",
+    "window",
+    "threshold",
+    "max_boundaries",
+    "boundary_count",
+    "boundaries",
+    "starts",
+)
+
+
+def sweep_boundaries(
+    segments: Sequence[Segment],
+    embeddings: np.ndarray,
+    rank_radii: list[int],
+    windows: list[int],
+    thresholds: list[float],
+    max_boundaries: list[int | None],
+    rank_engine: str = RANK_ENGINE,
+) -> list[dict[str, Any]]:
+    # The similarity matrix is shared by every setting, and the rank band with its
+    # prefix sums by every window of one radius; only boundary selection runs per row.
+    # The band is cut for the widest window, which covers every narrower one.
+    segment_count = len(segments)
+    auto_limit = auto_max_boundaries(segments)
+    similarities = np.asarray(embeddings @ embeddings.T, dtype=np.float32)
+    band_width = rank_band_width(max(windows))
+
+    rows = []
+    for rank_radius in rank_radii:
+        rank_matrix = local_rank_matrix(similarities, rank_radius, engine=rank_engine)
+        prefix = padded_row_prefix_sum(dense_rank_band(rank_matrix, band_width))
+        del rank_matrix
+        for window in windows:
+            scores = boundary_scores_from_prefix(prefix, segment_count, window)
+            for threshold, limit in itertools.product(thresholds, max_boundaries):
+                boundaries = select_ranked_boundaries(
+                    scores,
+                    segment_count=segment_count,
+                    min_segments=window,
+                    max_boundaries=auto_limit if limit is None else limit,
+                    rank_threshold=threshold,
+                )
+                rows.append(
+                    {
+                        "rank_radius": rank_radius,
+                        "window": window,
+                        "threshold": threshold,
+                        "max_boundaries": "auto" if limit is None else limit,
+                        "boundary_count": len(boundaries),
+                        "boundaries": ",".join(map(str, boundaries)),
+                        "starts": ",".join(
+                            ms_to_timestamp(segments[gap].start_at) for gap in boundaries
+                        ),
+                    }
+                )
+    return rows
+
+
+def parse_max_boundaries(value: str) -> int | None:
+    if value == "auto":
+        return None
+    return int(value)
+
+
+def default_sweep_path(transcript_path: Path, output_dir: Path) -> Path:
+    json_path, _ = default_output_paths(transcript_path, output_dir)
+    return json_path.with_name(json_path.name.replace(".chapters.json", ".sweep.tsv"))
+
+
+def write_sweep_table(rows: list[dict[str, Any]], output_path: Path) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=SWEEP_COLUMNS, delimiter="\t")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare chapter boundaries over a grid of C99 settings for one transcript."
+    )
+    parser.add_argument("transcript", type=Path, help="RTZR transcript JSON file.")
+    parser.add_argument("--rank-radius", type=int, nargs="+", default=[RANK_RADIUS])
+    parser.add_argument("--window", type=int, nargs="+", default=[WINDOW_SIZE])
+    parser.add_argument("--threshold", type=float, nargs="+", default=[BOUNDARY_RANK_THRESHOLD])
+    parser.add_argument(
+        "--max-boundaries",
+        type=parse_max_boundaries,
+        nargs="+",
+        default=[None],
+        help=f"Boundary limits to try. 'auto' uses the chapterize.py rule (at most {MAX_BOUNDARIES}).",
+    )
+    parser.add_argument(
+        "--rank-engine",
+        choices=RANK_ENGINES,
+        default=RANK_ENGINE,
+        help="C99 local rank implementation. 'loop' is the slow reference engine.",
+    )
+    parser.add_argument("--output-dir", type=Path, default=Path("data/outputs"))
+    parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default=EMBEDDING_BACKEND,
+        help="'onnx' exports an int8 ONNX model once; 'auto' uses that export when it exists.",
+    )
+    parser.add_argument(
+        "--embedding-threads",
+        type=int,
+        help="Intra-op CPU threads for the embedding model. Defaults to the runtime's choice.",
+    )
+    parser.add_argument(
+        "--embedding-cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Where to keep segment embeddings between runs.",
+    )
+    parser.add_argument(
+        "--embedding-cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_MB,
+        help="Evict least recently used embeddings above this cache size.",
+    )
+    parser.add_argument(
+        "--no-embedding-cache",
+        dest="embedding_cache",
+        action="store_false",
+        help="Always encode every segment with the embedding model.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    started_at = time.perf_counter()
+    transcript_path = args.transcript.expanduser().resolve()
+    segments = load_segments(transcript_path)
+    backend = resolve_embedding_backend(EMBEDDING_MODEL, args.embedding_backend)
+
+    cache = None
+    if args.embedding_cache:
+        cache = EmbeddingCache(
+            embedding_cache_name(EMBEDDING_MODEL, backend),
+            cache_dir=args.embedding_cache_dir,
+            max_mb=args.embedding_cache_max_mb,
+        )
+    try:
+        embeddings = encode_segments(
+            segments,
+            EMBEDDING_MODEL,
+            cache=cache,
+            backend=backend,
+            threads=args.embedding_threads,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+
+    rows = sweep_boundaries(
+        segments,
+        embeddings,
+        rank_radii=args.rank_radius,
+        windows=args.window,
+        thresholds=args.threshold,
+        max_boundaries=args.max_boundaries,
+        rank_engine=args.rank_engine,
+    )
+    output_path = default_sweep_path(transcript_path, args.output_dir)
+    write_sweep_table(rows, output_path)
+
+    print(f"configurations={len(rows)}")
+    print(f"saved={output_path}")
+    print(f"elapsed_sec={time.perf_counter() - started_at:.2f}")
+
+
+if __name__ == "__main__":
+    main()
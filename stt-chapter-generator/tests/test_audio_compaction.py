@@ -0,0 +1,96 @@
+import wave
+
+import audio_compaction
+import numpy as np
+import pytest
+from audio_compaction import PolyphaseResampler, compact_audio
+from rtzr_openapi_client import MultipartFileUpload, compacted_upload_stats
+
+
+@pytest.fixture(autouse=True)
+def without_ffmpeg(monkeypatch):
+    monkeypatch.setattr(audio_compaction.shutil, "which", lambda name: None)
+
+
+def write_wav(path, samples, sample_rate, channels=1):
+    with wave.open(str(path), "wb") as audio:
+        audio.setnchannels(channels)
+        audio.setsampwidth(2)
+        audio.setframerate(sample_rate)
+        audio.writeframes(np.repeat((samples * 16000).astype("<i2"), channels).tobytes())
+
+
+def read_wav(path):
+    with wave.open(str(path), "rb") as audio:
+        frames = audio.readframes(audio.getnframes())
+        return audio.getnchannels(), audio.getframerate(), np.frombuffer(frames, dtype="<i2")
+
+
+def test_stereo_wav_is_downmixed_and_resampled(tmp_path):
+    source = tmp_path / "meeting.wav"
+    write_wav(source, np.sin(2 * np.pi * 440 * np.arange(44100 * 3) / 44100), 44100, channels=2)
+    output_dir = tmp_path / "compacted"
+    output_dir.mkdir()
+
+    compacted = compact_audio(source, output_dir)
+
+    assert compacted.compacted
+    assert compacted.path.parent == output_dir
+    assert compacted.size_ratio == pytest.approx(44100 * 2 / 16000, rel=0.01)
+    channels, sample_rate, samples = read_wav(compacted.path)
+    assert (channels, sample_rate, len(samples)) == (1, 16000, 48000)
+    spectrum = np.abs(np.fft.rfft(samples))
+    assert np.fft.rfftfreq(len(samples), 1 / 16000)[spectrum.argmax()] == pytest.approx(440)
+
+
+def test_resampler_output_does_not_depend_on_block_size():
+    rng = np.random.default_rng(0)
+    signal = rng.standard_normal(10000)
+
+    whole = PolyphaseResampler(44100, 16000)
+    expected = np.concatenate([whole.process(signal), whole.flush()])
+    blocks = PolyphaseResampler(44100, 16000)
+    chunks = [blocks.process(signal[start : start + 777]) for start in range(0, 10000, 777)]
+    actual = np.concatenate([*chunks, blocks.flush()])
+
+    assert len(expected) == int(np.ceil(10000 * 16000 / 44100))
+    np.testing.assert_allclose(actual, expected)
+
+
+def test_files_that_would_not_shrink_are_uploaded_as_is(tmp_path):
+    mp3 = tmp_path / "call.mp3"
+    mp3.write_bytes(b"ID3" + bytes(1000))
+    narrowband = tmp_path / "call.wav"
+    write_wav(narrowband, np.zeros(8000), 8000)
+    output_dir = tmp_path / "compacted"
+    output_dir.mkdir()
+
+    for source in (mp3, narrowband):
+        compacted = compact_audio(source, output_dir)
+        assert compacted.path == source
+        assert not compacted.compacted
+        assert compacted.size_ratio == 1.0
+
+
+def test_source_directory_is_never_overwritten(tmp_path):
+    source = tmp_path / "meeting.wav"
+    write_wav(source, np.zeros(44100), 44100)
+
+    with pytest.raises(ValueError):
+        compact_audio(source, tmp_path)
+
+
+def test_upload_stats_report_original_size(tmp_path):
+    source = tmp_path / "meeting.wav"
+    write_wav(source, np.zeros(44100), 44100, channels=2)
+    output_dir = tmp_path / "compacted"
+    output_dir.mkdir()
+    compacted = compact_audio(source, output_dir)
+    upload = MultipartFileUpload(compacted.path, {"config": "{}"})
+    body = upload.read(len(upload))
+
+    stats = compacted_upload_stats(upload, compacted)
+
+    assert stats.bytes == len(body)
+    assert stats.original_bytes - stats.bytes == source.stat().st_size - compacted.bytes
+    assert stats.size_ratio > 5
@@ -0,0 +1,26 @@
+from benchmarks.bench_chapterize import find_regressions, scaling_exponents, synthetic_transcript
+
+
+def test_synthetic_transcript_is_rtzr_shaped():
+    payload, embeddings = synthetic_transcript(250, seed=1)
+
+    utterances = payload["results"]["utterances"]
+    assert len(utterances) == len(embeddings) == 250
+    assert all(utterance["msg"] for utterance in utterances)
+    starts = [utterance["start_at"] for utterance in utterances]
+    assert starts == sorted(starts)
+
+
+def test_find_regressions_respects_tolerance_and_noise_floor():
+    baseline = {"rank": {"1000": 0.10, "100": 0.001}, "texts": {"1000": 0.2}}
+    results = {"rank": {"1000": 0.16, "100": 0.009}, "texts": {"1000": 0.25}, "new": {"1000": 9.0}}
+
+    regressions = find_regressions(results, baseline, tolerance=0.5)
+
+    assert regressions == ["stage=rank segments=1000 sec=0.1600 baseline=0.1000"]
+
+
+def test_scaling_exponents_fit_log_log_slope():
+    exponents = scaling_exponents({"quadratic": {"10": 0.01, "100": 1.0}, "single": {"10": 1.0}})
+
+    assert exponents == {"quadratic": 2.0, "single": None}
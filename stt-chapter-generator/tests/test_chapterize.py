@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+from chapterize import (
+    Segment,
+    banded_similarities,
+    build_chapters_from_boundaries,
+    c99_boundary_score_array,
+    calculate_c99_boundary_scores,
+    local_rank_matrix,
+    local_rank_matrix_loop,
+    parse_args,
+    select_ranked_boundaries,
+    similarity_matrix,
+)
+
+SEED = 7
+
+
+def random_embeddings(segment_count, dimension=32, seed=SEED):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.normal(size=(segment_count, dimension)).astype(np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def random_similarities(segment_count, seed=SEED):
+    embeddings = random_embeddings(segment_count, seed=seed)
+    return np.asarray(embeddings @ embeddings.T, dtype=np.float32)
+
+
+@pytest.mark.parametrize("segment_count", [1, 2, 5, 40])
+@pytest.mark.parametrize("radius", [0, 1, 3, 6])
+def test_vectorized_rank_matrix_matches_loop(segment_count, radius):
+    similarities = random_similarities(segment_count)
+
+    expected = local_rank_matrix_loop(similarities, radius)
+    actual = local_rank_matrix(similarities, radius, engine="vectorized")
+
+    assert actual.dtype == expected.dtype
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_vectorized_rank_matrix_counts_ties():
+    similarities = np.ones((6, 6), dtype=np.float32)
+
+    np.testing.assert_array_equal(
+        local_rank_matrix(similarities, 2),
+        local_rank_matrix_loop(similarities, 2),
+    )
+
+
+def test_unknown_rank_engine():
+    with pytest.raises(ValueError):
+        local_rank_matrix(random_similarities(3), 1, engine="unknown")
+
+
+def reference_boundary_scores(rank_matrix, boundary_window):
+    # Direct block means over the full rank matrix, as in the C99 definition.
+    segment_count = len(rank_matrix)
+    scores = []
+    for gap in range(1, segment_count):
+        left = slice(max(0, gap - boundary_window), gap)
+        right = slice(gap, min(segment_count, gap + boundary_window))
+        within = (rank_matrix[left, left].mean() + rank_matrix[right, right].mean()) / 2.0
+        scores.append(within - rank_matrix[left, right].mean())
+    return np.array(scores)
+
+
+@pytest.mark.parametrize("segment_count", [2, 3, 9, 60])
+@pytest.mark.parametrize("boundary_window", [1, 2, 5])
+def test_dense_boundary_scores_match_block_means(segment_count, boundary_window):
+    embeddings = random_embeddings(segment_count, seed=segment_count)
+    rank_matrix = local_rank_matrix(random_similarities(segment_count, seed=segment_count), 3)
+
+    scores = c99_boundary_score_array(embeddings, 3, boundary_window)
+
+    expected = reference_boundary_scores(rank_matrix.astype(np.float64), boundary_window)
+    np.testing.assert_allclose(scores, expected, atol=1e-9)
+
+
+@pytest.mark.parametrize("segment_count", [2, 3, 9, 60, 700])
+def test_banded_boundary_scores_match_dense(segment_count):
+    embeddings = random_embeddings(segment_count, seed=segment_count)
+
+    dense = calculate_c99_boundary_scores(embeddings, rank_radius=3, boundary_window=5)
+    banded = calculate_c99_boundary_scores(
+        embeddings,
+        rank_radius=3,
+        boundary_window=5,
+        similarity_mode="banded",
+    )
+
+    assert banded.keys() == dense.keys()
+    np.testing.assert_allclose(list(banded.values()), list(dense.values()), atol=1e-9)
+
+
+def test_banded_similarities_store_only_the_band():
+    embeddings = random_embeddings(1000)
+
+    band = banded_similarities(embeddings, band_width=4, block_rows=64)
+
+    assert band.shape == (1000, 9)
+    dense = embeddings @ embeddings.T
+    np.testing.assert_array_equal(band[10], dense[10, 6:15])
+    assert np.isnan(band[0, :4]).all()
+
+
+@pytest.mark.parametrize("similarity_mode", ["dense", "banded"])
+def test_boundary_score_array_matches_dict(similarity_mode):
+    embeddings = random_embeddings(80)
+    segments = [Segment(start_at=index * 1000, text=f"segment {index}") for index in range(80)]
+
+    by_gap = calculate_c99_boundary_scores(embeddings, 3, 5, similarity_mode=similarity_mode)
+    scores = c99_boundary_score_array(embeddings, 3, 5, similarity_mode=similarity_mode)
+
+    assert scores.tolist() == list(by_gap.values())
+
+    selection = dict(segment_count=80, min_segments=5, max_boundaries=6, rank_threshold=0.385)
+    boundaries = select_ranked_boundaries(by_gap, **selection)
+    assert select_ranked_boundaries(scores, **selection) == boundaries
+
+    expected = build_chapters_from_boundaries(segments, boundaries, by_gap)
+    actual = build_chapters_from_boundaries(segments, boundaries, scores)
+    assert [chapter.boundary_score for chapter in actual] == [
+        chapter.boundary_score for chapter in expected
+    ]
+
+
+@pytest.mark.parametrize("precision", ["float16", "int8"])
+def test_reduced_similarities_rank_like_loop(precision):
+    similarities = similarity_matrix(random_embeddings(30), precision, block_rows=7)
+
+    assert similarities.dtype == np.dtype(precision)
+    expected = local_rank_matrix_loop(similarities, 3)
+    np.testing.assert_allclose(local_rank_matrix(similarities, 3), expected, atol=1e-3)
+
+
+@pytest.mark.parametrize("precision", ["float16", "int8"])
+def test_reduced_precision_scores_stay_close(precision):
+    embeddings = random_embeddings(200)
+
+    reference = c99_boundary_score_array(embeddings, 3, 5)
+    reduced = c99_boundary_score_array(embeddings, 3, 5, precision=precision)
+
+    # Edge gaps average only a few rank cells, so a single flipped tie moves them most.
+    difference = np.abs(reduced - reference)
+    assert difference[5:-5].max() < 0.05
+    assert difference.mean() < 0.02
+
+
+def test_reduced_precision_requires_dense_similarities():
+    with pytest.raises(ValueError):
+        c99_boundary_score_array(random_embeddings(20), 3, 5, similarity_mode="banded", precision="int8")
+
+
+@pytest.mark.parametrize(
+    "options", [["--precision", "float16"], ["--rank-engine", "loop"]]
+)
+def test_banded_similarities_reject_unsupported_options(monkeypatch, options):
+    argv = ["chapterize.py", "a.json", "--similarity", "banded", *options]
+    monkeypatch.setattr("sys.argv", argv)
+    with pytest.raises(SystemExit):
+        parse_args()
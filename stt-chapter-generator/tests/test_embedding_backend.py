@@ -0,0 +1,70 @@
+import json
+
+import embedding_backend
+import numpy as np
+import pytest
+from embedding_backend import (
+    VERIFICATION_FILE,
+    embedding_cache_name,
+    has_verified_onnx_export,
+    min_cosine_similarity,
+    onnx_export_dir,
+    onnx_file_name,
+    resolve_embedding_backend,
+)
+
+MODEL_NAME = "test/model"
+
+
+class FixedModel:
+    def __init__(self, vectors):
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+
+    def encode(self, texts, **kwargs):
+        vectors = self.vectors[: len(texts)]
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def write_export(export_dir, passed=True):
+    directory = onnx_export_dir(MODEL_NAME, export_dir)
+    (directory / onnx_file_name()).parent.mkdir(parents=True)
+    (directory / onnx_file_name()).write_bytes(b"onnx")
+    verification = {"file_name": onnx_file_name(), "min_cosine": 0.99, "passed": passed}
+    (directory / VERIFICATION_FILE).write_text(json.dumps(verification), encoding="utf-8")
+
+
+def test_auto_backend_uses_only_verified_exports(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_backend, "onnx_runtime_available", lambda: True)
+    assert resolve_embedding_backend(MODEL_NAME, "auto", tmp_path) == "torch"
+
+    write_export(tmp_path, passed=False)
+    assert not has_verified_onnx_export(MODEL_NAME, tmp_path)
+    assert resolve_embedding_backend(MODEL_NAME, "auto", tmp_path) == "torch"
+
+    (onnx_export_dir(MODEL_NAME, tmp_path) / VERIFICATION_FILE).unlink()
+    write_export(tmp_path / "verified")
+    assert resolve_embedding_backend(MODEL_NAME, "auto", tmp_path / "verified") == "onnx"
+
+    monkeypatch.setattr(embedding_backend, "onnx_runtime_available", lambda: False)
+    assert resolve_embedding_backend(MODEL_NAME, "auto", tmp_path / "verified") == "torch"
+    assert resolve_embedding_backend(MODEL_NAME, "torch", tmp_path / "verified") == "torch"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_embedding_backend(MODEL_NAME, "tensorrt")
+
+
+def test_onnx_vectors_are_cached_apart():
+    assert embedding_cache_name(MODEL_NAME, "torch") == MODEL_NAME
+    assert embedding_cache_name(MODEL_NAME, "onnx") != MODEL_NAME
+
+
+def test_min_cosine_similarity_reports_worst_text():
+    reference = FixedModel([[1, 0], [0, 1], [1, 1]])
+    candidate = FixedModel([[1, 0.1], [0, 1], [1, 0]])
+
+    assert min_cosine_similarity(reference, reference, ["a", "b", "c"]) == pytest.approx(1.0)
+    assert min_cosine_similarity(reference, candidate, ["a", "b", "c"]) == pytest.approx(
+        np.sqrt(0.5)
+    )
@@ -0,0 +1,130 @@
+import chapterize
+import numpy as np
+from chapterize import Segment, embed_texts, encode_segments, length_bucketed_batches
+from embedding_cache import EmbeddingCache
+
+MODEL_NAME = "test/model"
+
+
+class FakeModel:
+    def __init__(self, dimension=8):
+        self.dimension = dimension
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        vectors = np.array(
+            [[(hash(text) >> shift) % 97 + 1 for shift in range(self.dimension)] for text in texts],
+            dtype=np.float32,
+        ).reshape(len(texts), self.dimension)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def vector(value, dimension=4):
+    return np.full(dimension, value, dtype=np.float32)
+
+
+def test_cache_round_trip(tmp_path):
+    cache = EmbeddingCache(MODEL_NAME, cache_dir=tmp_path)
+    cache.put(["a", "b"], np.stack([vector(1), vector(2)]))
+    cache.close()
+
+    reopened = EmbeddingCache(MODEL_NAME, cache_dir=tmp_path)
+    found = reopened.get(["b", "c", "a"])
+
+    np.testing.assert_array_equal(found[0], vector(2))
+    assert found[1] is None
+    np.testing.assert_array_equal(found[2], vector(1))
+
+
+def test_cache_is_keyed_by_model(tmp_path):
+    EmbeddingCache(MODEL_NAME, cache_dir=tmp_path).put(["a"], np.stack([vector(1)]))
+
+    assert EmbeddingCache("other/model", cache_dir=tmp_path).get(["a"]) == [None]
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    max_mb = 3 * vector(0).nbytes / (1024 * 1024)
+    cache = EmbeddingCache(MODEL_NAME, cache_dir=tmp_path, max_mb=max_mb)
+    cache.put(["a", "b", "c"], np.stack([vector(1), vector(2), vector(3)]))
+    cache.get(["a"])
+
+    cache.put(["d"], np.stack([vector(4)]))
+
+    assert len(cache) == 3
+    found = cache.get(["a", "b", "c", "d"])
+    assert found[1] is None
+    np.testing.assert_array_equal(found[3], vector(4))
+
+
+def test_encode_segments_skips_model_for_cached_texts(tmp_path, monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(chapterize, "get_embedding_model", lambda model_name, *options: model)
+    segments = [Segment(start_at=0, text="첫 번째  발화"), Segment(start_at=1, text="두 번째 발화")]
+
+    first = encode_segments(segments, MODEL_NAME, 16, cache=EmbeddingCache(MODEL_NAME, tmp_path))
+    assert sorted(model.encoded) == sorted(["첫 번째 발화", "두 번째 발화"])
+
+    model.encoded.clear()
+    second = encode_segments(segments, MODEL_NAME, 16, cache=EmbeddingCache(MODEL_NAME, tmp_path))
+
+    assert model.encoded == []
+    np.testing.assert_array_equal(first, second)
+
+
+def test_encode_segments_embeds_repeated_utterances_once(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(chapterize, "get_embedding_model", lambda model_name, *options: model)
+    texts = ["네", "회의를 시작하겠습니다", "네", "예", " 네 ", "예"]
+    segments = [Segment(start_at=index, text=text) for index, text in enumerate(texts)]
+
+    embeddings = encode_segments(segments, MODEL_NAME, 16)
+
+    assert sorted(model.encoded) == sorted(["네", "회의를 시작하겠습니다", "예"])
+    assert embeddings.shape == (6, model.dimension)
+    np.testing.assert_array_equal(embeddings[0], embeddings[2])
+    np.testing.assert_array_equal(embeddings[0], embeddings[4])
+    np.testing.assert_array_equal(embeddings[3], embeddings[5])
+
+
+def test_length_bucketed_batches_respect_token_budget():
+    lengths = np.array([3, 40, 5, 12, 40, 2, 7])
+
+    batches = length_bucketed_batches(lengths, token_budget=48, max_batch_size=3)
+
+    assert sorted(np.concatenate(batches).tolist()) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 3
+        assert len(batch) == 1 or lengths[batch].max() * len(batch) <= 48
+    assert [lengths[batch].max() for batch in batches] == sorted(
+        (lengths[batch].max() for batch in batches),
+        reverse=True,
+    )
+
+
+def test_embed_texts_restores_input_order():
+    model = FakeModel()
+    texts = ["짧음", "조금 더 긴 문장입니다", "가장 길게 이어지는 발화 문장입니다", "네"]
+
+    embeddings, stats = embed_texts(model, texts, token_budget=20, max_batch_size=8)
+
+    np.testing.assert_array_equal(embeddings, FakeModel().encode(texts))
+    assert sum(batch.size for batch in stats) == len(texts)
+
+
+def test_reduced_precision_cache_stores_smaller_rows(tmp_path):
+    vectors = FakeModel(dimension=64).encode([f"문단 {index}" for index in range(5)])
+    texts = [f"문단 {index}" for index in range(5)]
+
+    for dtype, atol in [("float16", 1e-3), ("int8", 1e-2)]:
+        cache = EmbeddingCache(MODEL_NAME, cache_dir=tmp_path, dtype=dtype)
+        cache.put(texts, vectors)
+        cache.close()
+
+        reopened = EmbeddingCache(MODEL_NAME, cache_dir=tmp_path, dtype=dtype)
+        found = np.stack(reopened.get(texts))
+        assert found.dtype == np.float32
+        np.testing.assert_allclose(found, vectors, atol=atol)
+        assert reopened.row_bytes(64) < EmbeddingCache(MODEL_NAME, tmp_path).row_bytes(64) / 1.9
+
+    assert EmbeddingCache(MODEL_NAME, cache_dir=tmp_path).get(texts) == [None] * 5
@@ -0,0 +1,118 @@
+import json
+import os
+from types import SimpleNamespace
+
+import chapterize
+from chapterize import Chapter, add_representative_keywords, load_segments, render_chapter
+from keyword_index import KeywordHit, KeywordIndex, add_chapter_files
+
+
+def chapters_file(tmp_path, name, starts):
+    path = tmp_path / f"{name}.chapters.json"
+    path.write_text("[]", encoding="utf-8")
+    chapters = [
+        {
+            "number": number,
+            "start_at": start_at,
+            "start": f"00:00:{start_at // 1000:02d}",
+            "representative_text": f"{name} {number}",
+        }
+        for number, start_at in enumerate(starts, 1)
+    ]
+    return path, chapters
+
+
+def test_lookup_matches_all_or_any_keyword(tmp_path):
+    index = KeywordIndex(tmp_path / "index.sqlite3")
+    path, chapters = chapters_file(tmp_path, "meeting", [0, 5000])
+    index.update(path, chapters, [["예산", "서버"], ["예산", "Docker"]])
+    other, other_chapters = chapters_file(tmp_path, "podcast", [0])
+    index.update(other, other_chapters, [["서버"]])
+
+    assert index.lookup(["예산", "서버"]) == [KeywordHit("meeting", 1, 0, "00:00:00", "meeting 1")]
+    assert [(hit.transcript, hit.chapter) for hit in index.lookup(["서버"])] == [
+        ("meeting", 1),
+        ("podcast", 1),
+    ]
+    assert [(hit.transcript, hit.chapter) for hit in index.lookup(["docker", "서버"], False)] == [
+        ("meeting", 1),
+        ("meeting", 2),
+        ("podcast", 1),
+    ]
+    assert index.lookup(["없음"]) == []
+    assert len(index) == 2
+
+
+def test_reindexing_replaces_a_transcript(tmp_path):
+    index_path = tmp_path / "index.sqlite3"
+    index = KeywordIndex(index_path)
+    path, chapters = chapters_file(tmp_path, "meeting", [0, 5000])
+    index.update(path, chapters, [["예산"], ["서버"]])
+    assert index.is_current(path)
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert not index.is_current(path)
+    path, chapters = chapters_file(tmp_path, "meeting", [0])
+    index.update(path, chapters, [["일정"]])
+    index.close()
+
+    reopened = KeywordIndex(index_path)
+    assert reopened.lookup(["예산"]) == []
+    assert reopened.lookup(["서버"]) == []
+    assert [hit.chapter for hit in reopened.lookup(["일정"])] == [1]
+    assert len(reopened) == 1
+
+
+def test_same_name_in_other_directories_is_kept_apart(tmp_path):
+    index = KeywordIndex(tmp_path / "index.sqlite3")
+    for season in ("s1", "s2"):
+        (tmp_path / season).mkdir()
+        path, chapters = chapters_file(tmp_path / season, "ep1", [0])
+        index.update(path, chapters, [[f"{season}-keyword", "공통"]])
+
+    assert len(index) == 2
+    assert [hit.transcript for hit in index.lookup(["공통"])] == ["ep1", "ep1"]
+    assert len(index.lookup(["s1-keyword"])) == 1
+    assert len(index.lookup(["s2-keyword"])) == 1
+
+
+class FakeKiwi:
+    def __init__(self):
+        self.calls = []
+
+    def tokenize(self, texts):
+        self.calls.append(list(texts))
+        return [[SimpleNamespace(form=word, tag="NNG") for word in text.split()] for text in texts]
+
+
+def test_backfill_matches_chapterize_keywords(tmp_path, monkeypatch):
+    kiwi = FakeKiwi()
+    monkeypatch.setattr(chapterize, "get_kiwi", lambda: kiwi)
+    monkeypatch.setattr(chapterize, "SEGMENT_TOKEN_CACHE", chapterize.OrderedDict())
+    texts = ["예산 회의 예산", "예산 집행", "서버 배포", "서버 점검 일정"]
+    transcript_dir = tmp_path / "transcripts"
+    transcript_dir.mkdir()
+    transcript_path = transcript_dir / "meeting.transcript.json"
+    utterances = [{"start_at": index * 1000, "msg": text} for index, text in enumerate(texts)]
+    transcript_path.write_text(json.dumps({"results": {"utterances": utterances}}))
+
+    segments = load_segments(transcript_path)
+    chapters = [Chapter(0, segments[:2]), Chapter(2000, segments[2:])]
+    add_representative_keywords(chapters)
+    chapters_path = tmp_path / "meeting.chapters.json"
+    rendered = [render_chapter(chapter, number) for number, chapter in enumerate(chapters, 1)]
+    chapters_path.write_text(json.dumps(rendered, ensure_ascii=False))
+    kiwi.calls.clear()
+    monkeypatch.setattr(chapterize, "SEGMENT_TOKEN_CACHE", chapterize.OrderedDict())
+
+    index = KeywordIndex(tmp_path / "index.sqlite3")
+    assert add_chapter_files(index, [chapters_path], transcript_dir) == (1, 0, 0)
+    assert kiwi.calls == [texts]
+    for number, chapter in enumerate(chapters, 1):
+        hits = index.lookup(chapter.representative_keywords)
+        assert [hit.chapter for hit in hits] == [number]
+
+    orphan_path = tmp_path / "orphan.chapters.json"
+    orphan_path.write_text(json.dumps(rendered, ensure_ascii=False))
+    assert add_chapter_files(index, [orphan_path], transcript_dir) == (1, 0, 1)
@@ -0,0 +1,90 @@
+import random
+import re
+
+import numpy as np
+import pytest
+from keyword_matcher import (
+    KeywordMatcher,
+    count_keyword_hits,
+    range_hit_counts,
+    sliding_window_hits,
+)
+
+ALPHABET = ["a", "A", "b", "aa", "ab", " ", "네", "회의", "예산", "İ", "i", "ß", "ſ", "s", "ς", "σ"]
+KEYWORDS = ["aa", "ab", "aba", "a b", "회의", "예산", "회의 예산", "ss", "i", "s", "σ", "aaa"]
+
+
+def regex_hit_counts(text, keywords):
+    return [len(re.findall(re.escape(keyword), text, re.IGNORECASE)) for keyword in keywords]
+
+
+def random_cases(count, seed=11):
+    rng = random.Random(seed)
+    for _ in range(count):
+        text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+        yield text, rng.sample(KEYWORDS, rng.randint(1, 6)), rng
+
+
+def test_find_reports_overlapping_occurrences():
+    matcher = KeywordMatcher(["aa", "회의"])
+
+    assert matcher.find("aaa 회의") == [(0, 2, 0), (1, 3, 0), (4, 6, 1)]
+
+
+@pytest.mark.parametrize(
+    "text, keywords",
+    [
+        ("aaaa", ["aa"]),
+        ("abababa", ["aba", "ab"]),
+        ("Server SERVER server", ["server"]),
+        ("회의 예산 회의예산", ["회의", "예산", "회의 예산"]),
+    ],
+)
+def test_hit_counts_match_regex(text, keywords):
+    assert KeywordMatcher(keywords).hit_counts(text) == regex_hit_counts(text, keywords)
+
+
+def test_random_hit_counts_match_regex():
+    for text, keywords, rng in random_cases(2000):
+        matcher = KeywordMatcher(keywords)
+        assert matcher.hit_counts(text) == regex_hit_counts(text, keywords)
+
+        start = rng.randint(0, len(text))
+        end = rng.randint(start, len(text))
+        counts = count_keyword_hits(matcher.find(text), len(keywords), start, end)
+        assert counts == regex_hit_counts(text[start:end], keywords)
+
+
+def window_hits(text, keywords, start, width):
+    counts = regex_hit_counts(text[start : start + width], keywords)
+    return sum(1 for count in counts if count > 0), sum(counts)
+
+
+def test_sliding_window_hits_match_sliced_windows():
+    for text, keywords, rng in random_cases(1000, seed=23):
+        width = rng.randint(1, 12)
+        matches = KeywordMatcher(keywords).find(text)
+        yielded = list(sliding_window_hits(matches, len(keywords), len(text), width))
+
+        assert yielded[0][0] == 0
+        for start, unique_hits, total_hits in yielded:
+            assert (unique_hits, total_hits) == window_hits(text, keywords, start, width)
+
+        # Counts only change at yielded starts, so every skipped start repeats the
+        # previous yielded value.
+        starts = [start for start, _, _ in yielded]
+        for start in range(max(0, len(text) - width) + 1):
+            previous = yielded[sum(1 for value in starts if value <= start) - 1]
+            assert previous[1:] == window_hits(text, keywords, start, width)
+
+
+def test_range_hit_counts_match_sliced_ranges():
+    for text, keywords, rng in random_cases(300, seed=19):
+        ranges = [sorted(rng.sample(range(len(text) + 1), 2)) for _ in range(5)] if text else []
+        starts = np.array([start for start, _ in ranges], dtype=np.int64)
+        ends = np.array([end for _, end in ranges], dtype=np.int64)
+        counts = range_hit_counts(KeywordMatcher(keywords).find(text), len(keywords), starts, ends)
+
+        assert counts.shape == (len(ranges), len(keywords))
+        for (start, end), row in zip(ranges, counts.tolist()):
+            assert row == regex_hit_counts(text[start:end], keywords)
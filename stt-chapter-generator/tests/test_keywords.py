@@ -0,0 +1,82 @@
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import chapterize
+from chapterize import (
+    Chapter,
+    Segment,
+    add_representative_keywords,
+    add_representative_texts,
+    segment_keyword_tokens,
+)
+from segment_store import SegmentStore
+
+
+class FakeKiwi:
+    def __init__(self):
+        self.calls = []
+
+    def tokenize(self, texts):
+        self.calls.append(list(texts))
+        return [[SimpleNamespace(form=word, tag="NNG") for word in text.split()] for text in texts]
+
+
+def use_fake_kiwi(monkeypatch):
+    kiwi = FakeKiwi()
+    monkeypatch.setattr(chapterize, "get_kiwi", lambda: kiwi)
+    monkeypatch.setattr(chapterize, "SEGMENT_TOKEN_CACHE", chapterize.OrderedDict())
+    return kiwi
+
+
+def test_segment_tokens_are_cached_across_calls(monkeypatch):
+    kiwi = use_fake_kiwi(monkeypatch)
+    texts = ["예산 회의", "예산 회의", "일정 공유"]
+
+    first = segment_keyword_tokens(texts)
+    second = segment_keyword_tokens(texts + ["다음 안건"])
+
+    assert first == [["예산", "회의"], ["예산", "회의"], ["일정", "공유"]]
+    assert second[:3] == first
+    assert kiwi.calls == [["예산 회의", "일정 공유"], ["다음 안건"]]
+
+
+def test_rechaptering_reuses_segment_tokens(monkeypatch):
+    kiwi = use_fake_kiwi(monkeypatch)
+    segments = [Segment(index, text) for index, text in enumerate(["예산 회의", "예산 집행", "일정 공유"])]
+
+    split = [Chapter(0, segments[:2]), Chapter(2, segments[2:])]
+    add_representative_keywords(split)
+    merged = [Chapter(0, segments)]
+    add_representative_keywords(merged)
+
+    assert len(kiwi.calls) == 1
+    assert split[0].representative_keywords[0] == "예산"
+    assert merged[0].representative_keywords[0] == "예산"
+    assert set(merged[0].representative_keywords) == {"예산", "회의", "집행", "일정", "공유"}
+
+
+def test_parallel_representative_texts_match_sequential():
+    words = ["예산", "집행", "서버", "배포", "전시", "관람", "그리고", "정리하면"]
+    store = SegmentStore.from_segments(
+        [
+            Segment(index * 1000, " ".join(words[(index * step) % 8] for step in range(1, 12)))
+            for index in range(60)
+        ]
+    )
+
+    def chapters():
+        result = [Chapter(start * 1000, store[start : start + 10]) for start in range(0, 60, 10)]
+        for index, chapter in enumerate(result):
+            chapter.representative_keywords = [words[index], words[index + 1]]
+        return result
+
+    sequential = chapters()
+    add_representative_texts(sequential)
+    parallel = chapters()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        add_representative_texts(parallel, executor)
+
+    assert [chapter.representative_text for chapter in parallel] == [
+        chapter.representative_text for chapter in sequential
+    ]
+    assert all(chapter.representative_text for chapter in parallel)
@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+from chapterize import Segment, split_into_chapters_c99
+from profiling import StageProfiler, profile_stage, record_count
+
+from tests.test_chapterize import random_embeddings
+
+
+def test_profiler_records_pipeline_stages(tmp_path):
+    segments = [Segment(start_at=index, text="가" * 60) for index in range(40)]
+
+    with StageProfiler() as profiler:
+        chapters = split_into_chapters_c99(segments, random_embeddings(40))
+        record_count("chapters", len(chapters))
+        with profile_stage("allocate"):
+            np.ones(1 << 20)
+
+    path = tmp_path / "audio.profile.json"
+    profiler.write(path, transcript="audio.transcript.json")
+    report = json.loads(path.read_text(encoding="utf-8"))
+
+    names = [stage["name"] for stage in report["stages"]]
+    assert names == [
+        "similarity",
+        "rank_matrix",
+        "prefix_sums",
+        "boundary_scores",
+        "boundary_selection",
+        "allocate",
+    ]
+    assert report["counts"] == {"chapters": len(chapters)}
+    assert report["transcript"] == "audio.transcript.json"
+    allocate = report["stages"][-1]
+    assert allocate["calls"] == 1
+    assert allocate["tracemalloc_peak_mb"] >= 8
+
+
+def test_stages_are_ignored_without_profiler():
+    with profile_stage("unused"):
+        record_count("segments", 1)
+
+    with StageProfiler() as profiler:
+        pass
+    assert profiler.report()["stages"] == []
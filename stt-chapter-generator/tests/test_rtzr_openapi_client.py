@@ -0,0 +1,81 @@
+import asyncio
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+
+import pytest
+from rtzr_openapi_client import MultipartFileUpload
+
+
+def parse_multipart(upload, body):
+    header = f"Content-Type: {upload.content_type}\r\n\r\n".encode()
+    message = BytesParser(policy=HTTP).parsebytes(header + body)
+    return {
+        part.get_param("name", header="content-disposition"): (
+            part.get_filename(),
+            part.get_payload(decode=True),
+        )
+        for part in message.iter_parts()
+    }
+
+
+@pytest.fixture
+def audio_path(tmp_path):
+    path = tmp_path / '회의 "녹음".wav'
+    path.write_bytes(bytes(range(256)) * 1000)
+    return path
+
+
+@pytest.mark.parametrize("read_size", [1, 7, 4096, 1 << 20])
+def test_upload_body_is_valid_multipart(audio_path, read_size):
+    upload = MultipartFileUpload(audio_path, {"config": '{"language": "ko"}'}, chunk_bytes=1000)
+
+    chunks = []
+    while chunk := upload.read(read_size):
+        assert len(chunk) <= read_size
+        chunks.append(chunk)
+    body = b"".join(chunks)
+
+    assert len(body) == len(upload)
+    assert upload.stats().bytes == len(upload)
+    assert parse_multipart(upload, body) == {
+        "config": (None, b'{"language": "ko"}'),
+        "file": ('회의 %22녹음%22.wav', audio_path.read_bytes()),
+    }
+
+
+def test_upload_iterates_in_chunks(audio_path):
+    upload = MultipartFileUpload(audio_path, {"config": "{}"}, chunk_bytes=1000)
+    reference = MultipartFileUpload(audio_path, {"config": "{}"}, chunk_bytes=1000)
+
+    async def collect():
+        return [chunk async for chunk in reference]
+
+    chunks = list(upload)
+    async_chunks = asyncio.run(collect())
+
+    assert max(map(len, chunks)) == 1000
+    assert sum(map(len, chunks)) == len(upload)
+    assert sum(map(len, async_chunks)) == len(reference)
+    assert parse_multipart(reference, b"".join(async_chunks))["file"][1] == audio_path.read_bytes()
+
+
+def test_async_iteration_reads_off_the_event_loop(audio_path, monkeypatch):
+    upload = MultipartFileUpload(audio_path, {"config": "{}"}, chunk_bytes=1000)
+    loop_thread = threading.get_ident()
+    read_threads = set()
+    read = upload.read
+
+    def tracked_read(size=-1):
+        read_threads.add(threading.get_ident())
+        return read(size)
+
+    monkeypatch.setattr(upload, "read", tracked_read)
+
+    async def collect():
+        return b"".join([chunk async for chunk in upload])
+
+    body = asyncio.run(collect())
+
+    assert len(body) == len(upload)
+    assert loop_thread not in read_threads
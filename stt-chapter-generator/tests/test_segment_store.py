@@ -0,0 +1,94 @@
+import io
+import json
+
+import pytest
+from chapterize import Chapter, build_chapters_from_boundaries, load_segments
+from segment_store import Segment, SegmentStore, iter_transcript_utterances
+
+UTTERANCES = [
+    {"start_at": 0, "msg": " 회의를 시작하겠습니다 ", "spk": 0},
+    {"start_at": 1500, "msg": ""},
+    {"start_at": 2300, "msg": "예산 안건입니다", "lang": "ko"},
+    {"start_at": 12345678901, "msg": "다음은 \"일정\" 공유\n입니다"},
+]
+
+
+def expected_segments():
+    return [
+        Segment(start_at=int(item["start_at"]), text=item["msg"].strip())
+        for item in UTTERANCES
+        if item["msg"].strip()
+    ]
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 3, 7, 64, 1 << 16])
+@pytest.mark.parametrize(
+    "payload",
+    [
+        UTTERANCES,
+        {"id": "x", "results": {"utterances": UTTERANCES, "verified": False}, "status": "ok"},
+        {"status": "ok", "meta": {"results": [1, 2.5e3, None]}, "results": {"utterances": UTTERANCES}},
+    ],
+)
+def test_streaming_parser_matches_json_loads(payload, chunk_chars):
+    text = json.dumps(payload, ensure_ascii=False, indent=1)
+
+    utterances = list(iter_transcript_utterances(io.StringIO(text), chunk_chars))
+
+    assert utterances == UTTERANCES
+
+
+@pytest.mark.parametrize(
+    ("number", "split"),
+    [
+        (number, split)
+        for number in ["1234.5", "-1e10", "2.5E-3", "1234"]
+        for split in range(len(number) + 1)
+    ],
+)
+def test_streaming_parser_reads_numbers_split_across_chunks(number, split):
+    prefix = '{"audio_sec": '
+    text = f'{prefix}{number}, "results": {{"utterances": {json.dumps(UTTERANCES)}}}}}'
+
+    utterances = iter_transcript_utterances(io.StringIO(text), len(prefix) + split)
+
+    assert list(utterances) == UTTERANCES
+
+
+@pytest.mark.parametrize("payload", [{}, [], {"results": []}, {"results": {"utterances": {}}}, 3])
+def test_streaming_parser_without_utterances(payload):
+    assert list(iter_transcript_utterances(io.StringIO(json.dumps(payload)), 2)) == []
+
+
+def test_load_segments_builds_columnar_store(tmp_path):
+    path = tmp_path / "audio.transcript.json"
+    path.write_text(json.dumps({"results": {"utterances": UTTERANCES}}), encoding="utf-8")
+
+    segments = load_segments(path)
+
+    assert isinstance(segments, SegmentStore)
+    assert list(segments) == expected_segments()
+    assert segments.text == " ".join(segment.text for segment in expected_segments())
+    assert segments[-1] == expected_segments()[-1]
+
+
+def test_chapters_are_views_over_the_store():
+    store = SegmentStore.from_segments(
+        Segment(start_at=index * 1000, text=f"문단 {index}") for index in range(12)
+    )
+
+    chapters = build_chapters_from_boundaries(store, [5, 9], {5: 0.5, 9: 0.25})
+
+    assert [chapter.start_at for chapter in chapters] == [0, 5000, 9000]
+    assert all(chapter.segments.buffer is store.buffer for chapter in chapters)
+    assert chapters[1].text == " ".join(f"문단 {index}" for index in range(5, 9))
+    assert chapters[1].text == Chapter(5000, list(chapters[1].segments)).text
+    assert list(chapters[2].segments[1:]) == [Segment(10000, "문단 10"), Segment(11000, "문단 11")]
+
+
+def test_empty_transcript_is_rejected(tmp_path):
+    path = tmp_path / "empty.transcript.json"
+    path.write_text(json.dumps({"results": {"utterances": [{"msg": " "}]}}), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        load_segments(path)
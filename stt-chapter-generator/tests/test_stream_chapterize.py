@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from chapterize import Segment, c99_boundary_score_array
+from stream_chapterize import OnlineC99Segmenter, parse_input_line
+
+from tests.test_chapterize import random_embeddings
+
+
+def topic_embeddings(topic_lengths, dimension=32, seed=3):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for length in topic_lengths:
+        center = rng.normal(size=dimension)
+        rows.append(center + 0.4 * rng.normal(size=(length, dimension)))
+    embeddings = np.concatenate(rows).astype(np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+
+def push_all(segmenter, embeddings, text="가" * 40):
+    events = []
+    for index, embedding in enumerate(embeddings):
+        events.extend(segmenter.push(Segment(start_at=index * 1000, text=text), embedding))
+    events.extend(segmenter.finish())
+    return events
+
+
+@pytest.mark.parametrize("segment_count", [1, 2, 7, 15, 16, 17, 90])
+def test_online_scores_match_batch(segment_count):
+    embeddings = random_embeddings(segment_count, seed=segment_count)
+    segmenter = OnlineC99Segmenter()
+
+    push_all(segmenter, embeddings)
+
+    expected = c99_boundary_score_array(embeddings, rank_radius=3, boundary_window=5)
+    np.testing.assert_allclose(segmenter._scores, expected, atol=1e-9)
+    assert len(segmenter._tail) <= 16
+
+
+def test_online_boundaries_follow_topic_changes():
+    segmenter = OnlineC99Segmenter(min_chapter_chars=0)
+
+    events = push_all(segmenter, topic_embeddings([12, 15, 10]))
+
+    finals = [event.gap for event in events if event.kind == "final"]
+    assert finals == segmenter.boundaries == [12, 27]
+    assert [event.start_at for event in events if event.kind == "final"] == [12000, 27000]
+
+
+def test_final_decisions_have_bounded_latency():
+    embeddings = topic_embeddings([12, 15, 10])
+    segmenter = OnlineC99Segmenter(min_chapter_chars=0)
+
+    first_seen = {}
+    for index, embedding in enumerate(embeddings):
+        for event in segmenter.push(Segment(start_at=index, text="가"), embedding):
+            first_seen.setdefault((event.kind, event.gap), index + 1)
+
+    for (kind, gap), count in first_seen.items():
+        if kind == "final":
+            assert count - gap == segmenter.finalization_delay
+        if kind == "provisional":
+            assert count - gap <= segmenter.finalization_delay
+
+
+def test_every_provisional_is_resolved():
+    segmenter = OnlineC99Segmenter(min_chapter_chars=0)
+
+    events = push_all(segmenter, random_embeddings(120, seed=5))
+
+    open_gaps = set()
+    for event in events:
+        if event.kind == "provisional":
+            open_gaps.add(event.gap)
+        else:
+            open_gaps.discard(event.gap)
+    assert not open_gaps
+    assert all(b - a >= 5 for a, b in zip(segmenter.boundaries, segmenter.boundaries[1:]))
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ('{"start_at": 12000, "msg": " 안녕하세요 "}\n', Segment(12000, "안녕하세요")),
+        ("\x1b[K3.25 ~ 5.75 : 오늘 회의를 시작합니다\n", Segment(3250, "오늘 회의를 시작합니다")),
+        ("\x1b[K3.25 ~ : 오늘\r\x1b[K3.25 ~ 5.75 : 오늘 회의를\n", Segment(3250, "오늘 회의를")),
+        ("\x1b[K3.25 ~ : 오늘 회의를\r", None),
+        ('{"start_at": 0, "msg": ""}\n', None),
+        ("Program terminated by user.\n", None),
+        ("\n", None),
+    ],
+)
+def test_input_lines_accept_json_and_stream_stt_output(line, expected):
+    assert parse_input_line(line) == expected
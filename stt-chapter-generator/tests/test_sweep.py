@@ -0,0 +1,30 @@
+from chapterize import Segment, split_into_chapters_c99
+from sweep import sweep_boundaries
+
+from tests.test_chapterize import random_embeddings
+
+
+def test_default_setting_matches_chapterize():
+    segments = [Segment(start_at=index * 1000, text="가" * 60) for index in range(90)]
+    embeddings = random_embeddings(90)
+
+    rows = sweep_boundaries(
+        segments,
+        embeddings,
+        rank_radii=[2, 3],
+        windows=[4, 5],
+        thresholds=[0.2, 0.385],
+        max_boundaries=[None, 3],
+    )
+
+    assert len(rows) == 16
+    default = next(
+        row
+        for row in rows
+        if (row["rank_radius"], row["window"], row["threshold"], row["max_boundaries"])
+        == (3, 5, 0.385, "auto")
+    )
+    chapters = split_into_chapters_c99(segments, embeddings)
+    expected = [segments.index(chapter.segments[0]) for chapter in chapters[1:]]
+    assert default["boundaries"] == ",".join(map(str, expected))
+    assert all(row["boundary_count"] <= 3 for row in rows if row["max_boundaries"] == 3)
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import transcribe
+from rtzr_openapi_client import UploadStats
+from transcribe import find_audio_files, transcribe_batch
+
+
+class FakeAsyncClient:
+    def __init__(self, **kwargs):
+        self.active_uploads = 0
+        self.max_active_uploads = 0
+        self.polls = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def transcribe_file(self, file_path, config, upload_stats=None, compact=False):
+        self.active_uploads += 1
+        self.max_active_uploads = max(self.max_active_uploads, self.active_uploads)
+        await asyncio.sleep(0.001)
+        self.active_uploads -= 1
+        if file_path.stem == "broken":
+            raise RuntimeError("upload rejected")
+        upload_stats.append(UploadStats(bytes=4, seconds=0.001))
+        return {"id": file_path.stem}
+
+    async def get_transcription(self, transcribe_id):
+        self.polls[transcribe_id] = self.polls.get(transcribe_id, 0) + 1
+        if transcribe_id == "bad":
+            return {"id": transcribe_id, "status": "failed"}
+        if self.polls[transcribe_id] < int(transcribe_id.removeprefix("audio")) % 3 + 1:
+            return {"id": transcribe_id, "status": "transcribing"}
+        return {"id": transcribe_id, "status": "completed", "results": {"utterances": []}}
+
+
+def test_batch_bounds_uploads_and_saves_every_transcript(tmp_path, monkeypatch):
+    client = FakeAsyncClient()
+    monkeypatch.setattr(transcribe, "AsyncRTZROpenAPIClient", lambda **kwargs: client)
+    audio_dir = tmp_path / "audio"
+    audio_dir.mkdir()
+    names = [f"audio{index}.wav" for index in range(10)] + ["bad.mp3", "broken.m4a", "notes.txt"]
+    for name in names:
+        (audio_dir / name).write_bytes(b"RIFF")
+
+    audio_paths = find_audio_files(audio_dir)
+    failures = asyncio.run(
+        transcribe_batch(
+            audio_paths,
+            {"model_name": "sommers"},
+            tmp_path / "out",
+            concurrency=3,
+            poll_interval_sec=0,
+        )
+    )
+
+    assert len(audio_paths) == 12
+    assert failures == 2
+    assert client.max_active_uploads == 3
+    saved = sorted(path.name for path in (tmp_path / "out").iterdir())
+    assert saved == sorted(f"audio{index}.transcript.json" for index in range(10))
+    transcript = json.loads((tmp_path / "out" / "audio4.transcript.json").read_text())
+    assert transcript["status"] == "completed"
+    assert client.polls["audio4"] == 2
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+
+import pytest
+import transcribe
+from transcribe import cache_config, transcribe_batch
+from transcript_cache import TranscriptCache, canonical_config
+
+CONFIG = {"model_name": "sommers", "language": "ko", "use_disfluency_filter": True}
+
+
+def transcript(text):
+    return {"status": "completed", "results": {"utterances": [{"msg": text}]}}
+
+
+@pytest.fixture
+def audio_path(tmp_path):
+    path = tmp_path / "meeting.wav"
+    path.write_bytes(b"RIFF" + bytes(4096))
+    return path
+
+
+def test_cache_round_trip_by_content_and_config(tmp_path, audio_path):
+    cache = TranscriptCache(tmp_path / "cache")
+    cache.put(audio_path, CONFIG, transcript("안녕하세요"))
+    cache.close()
+
+    copy = tmp_path / "copy.wav"
+    copy.write_bytes(audio_path.read_bytes())
+    reordered = dict(reversed(list(CONFIG.items())))
+    reopened = TranscriptCache(tmp_path / "cache")
+
+    assert canonical_config(reordered) == canonical_config(CONFIG)
+    assert reopened.get(copy, reordered) == transcript("안녕하세요")
+    assert reopened.get(audio_path, {**CONFIG, "language": "en"}) is None
+
+
+def test_changed_audio_is_hashed_again(tmp_path, audio_path):
+    cache = TranscriptCache(tmp_path / "cache")
+    cache.put(audio_path, CONFIG, transcript("before"))
+
+    audio_path.write_bytes(b"RIFF" + bytes(8192))
+
+    assert cache.get(audio_path, CONFIG) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    size = len(json.dumps(transcript("a")).encode("utf-8"))
+    cache = TranscriptCache(tmp_path / "cache", max_mb=2.5 * size / (1024 * 1024))
+    paths = []
+    for index, name in enumerate("abc"):
+        path = tmp_path / f"{name}.wav"
+        path.write_bytes(bytes([index]) * 100)
+        os.utime(path, ns=(index, index))
+        paths.append(path)
+
+    cache.put(paths[0], CONFIG, transcript("a"))
+    cache.put(paths[1], CONFIG, transcript("b"))
+    cache.get(paths[0], CONFIG)
+    cache.put(paths[2], CONFIG, transcript("c"))
+
+    assert len(cache) == 2
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 2
+    hashed = [row[0] for row in cache._index.execute("SELECT path FROM audio_hashes")]
+    assert sorted(hashed) == sorted(str(path.resolve()) for path in (paths[0], paths[2]))
+    assert cache.get(paths[1], CONFIG) is None
+    assert cache.get(paths[0], CONFIG) == transcript("a")
+
+
+def test_batch_skips_api_for_cached_audio(tmp_path, audio_path, monkeypatch):
+    cache = TranscriptCache(tmp_path / "cache")
+    cache.put(audio_path, cache_config(CONFIG, compact=False), transcript("저장된 전사"))
+
+    def no_client(**kwargs):
+        raise AssertionError("cached audio must not open an API client")
+
+    monkeypatch.setattr(transcribe, "AsyncRTZROpenAPIClient", no_client)
+    failures = asyncio.run(transcribe_batch([audio_path], CONFIG, tmp_path / "out", cache=cache))
+
+    assert failures == 0
+    saved = json.loads((tmp_path / "out" / "meeting.transcript.json").read_text())
+    assert saved == transcript("저장된 전사")
+
+
+def test_compacted_and_original_uploads_are_cached_apart(tmp_path, audio_path):
+    cache = TranscriptCache(tmp_path / "cache")
+    cache.put(audio_path, cache_config(CONFIG, compact=True), transcript("16kHz mono"))
+
+    assert cache.get(audio_path, cache_config(CONFIG, compact=False)) is None
+    cache.put(audio_path, cache_config(CONFIG, compact=False), transcript("original"))
+    assert cache.get(audio_path, cache_config(CONFIG, compact=True)) == transcript("16kHz mono")
+    assert cache.get(audio_path, cache_config(CONFIG, compact=False)) == transcript("original")
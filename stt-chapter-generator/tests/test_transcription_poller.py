@@ -0,0 +1,128 @@
+import asyncio
+import random
+
+import pytest
+from transcription_poller import PollJob, TranscriptionPoller
+
+
+def make_poller(**kwargs):
+    async def fetch(transcribe_id):
+        raise AssertionError("not polled")
+
+    return TranscriptionPoller(fetch, rng=random.Random(0), **kwargs)
+
+
+def test_delays_wait_for_expected_time_then_back_off_with_jitter():
+    poller = make_poller(
+        min_interval_sec=1.0,
+        max_interval_sec=10.0,
+        backoff_factor=2.0,
+        jitter=0.2,
+    )
+    job = PollJob("a", submitted_at=0.0, expected_sec=30.0, deadline=900.0)
+
+    assert 6.0 * 0.8 <= poller.next_delay(job, now=24.0) <= 6.0
+    assert job.overdue_polls == 0
+    delays = [poller.next_delay(job, now=40.0) for _ in range(6)]
+    for delay, expected in zip(delays, [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]):
+        assert expected * 0.8 <= delay <= expected
+    assert len(set(delays)) == len(delays)
+
+
+def test_first_poll_follows_audio_duration():
+    poller = make_poller(min_interval_sec=1.0, max_interval_sec=600.0)
+    short = poller.add("short", audio_duration_sec=5)
+    long = poller.add("long", audio_duration_sec=3600)
+    very_long = poller.add("very_long", audio_duration_sec=4 * 3600)
+
+    due = {job.transcribe_id: due_at for due_at, _, job in poller._schedule}
+    assert due["short"] - short.submitted_at == pytest.approx(1.0)
+    assert due["long"] - long.submitted_at == pytest.approx(360.0)
+    assert due["very_long"] - very_long.submitted_at == pytest.approx(600.0)
+    assert very_long.expected_sec == pytest.approx(1440.0)
+    assert len(poller) == 3
+
+
+def test_run_polls_every_job_until_done():
+    polls = {}
+    polls_needed = {**{f"job{index}": index + 1 for index in range(5)}, "bad": 1, "flaky": 2}
+
+    async def fetch(transcribe_id):
+        polls[transcribe_id] = polls.get(transcribe_id, 0) + 1
+        if transcribe_id == "flaky" and polls[transcribe_id] == 1:
+            raise ConnectionError("reset")
+        if polls[transcribe_id] < polls_needed[transcribe_id]:
+            return {"id": transcribe_id, "status": "transcribing"}
+        status = "failed" if transcribe_id == "bad" else "completed"
+        return {"id": transcribe_id, "status": status}
+
+    async def scenario():
+        delivered = []
+        poller = TranscriptionPoller(
+            fetch,
+            on_result=lambda job, result: delivered.append((job.context, result["status"])),
+            min_interval_sec=0.001,
+            max_interval_sec=0.005,
+        )
+        running = asyncio.create_task(poller.run())
+        for index in range(5):
+            poller.add(f"job{index}", context=index)
+            await asyncio.sleep(0.001)
+        poller.add("bad", context="bad")
+        poller.add("flaky", context="flaky")
+        poller.close()
+        return await running, delivered
+
+    metrics, delivered = asyncio.run(scenario())
+
+    assert sorted(delivered, key=str) == sorted(
+        [(index, "completed") for index in range(5)] + [("bad", "failed"), ("flaky", "completed")],
+        key=str,
+    )
+    assert metrics.requests == sum(polls.values()) == 15 + 1 + 2
+    assert metrics.errors == 1
+    assert (metrics.completed, metrics.failed, metrics.timed_out) == (6, 1, 0)
+    assert len(metrics.detection_latencies) == 5
+    assert metrics.summary()["requests_per_job"] == pytest.approx(18 / 7, abs=1e-3)
+
+
+def test_results_go_to_queue_and_time_out():
+    async def fetch(transcribe_id):
+        return {"id": transcribe_id, "status": "transcribing"}
+
+    async def scenario():
+        poller = TranscriptionPoller(fetch, min_interval_sec=0.001, timeout_sec=0.01)
+        poller.add("slow")
+        poller.close()
+        metrics = await poller.run()
+        return metrics, poller.results.get_nowait()
+
+    metrics, (job, result) = asyncio.run(scenario())
+
+    assert job.transcribe_id == "slow"
+    assert result == {"id": "slow", "status": "timed_out"}
+    assert metrics.timed_out == 1
+
+
+def test_failing_callback_does_not_stop_other_jobs():
+    async def fetch(transcribe_id):
+        return {"id": transcribe_id, "status": "completed"}
+
+    delivered = []
+
+    def on_result(job, result):
+        if job.transcribe_id == "disk-full":
+            raise OSError("No space left on device")
+        delivered.append(job.transcribe_id)
+
+    async def scenario():
+        poller = TranscriptionPoller(fetch, on_result=on_result, min_interval_sec=0.001)
+        for transcribe_id in ("a", "disk-full", "b"):
+            poller.add(transcribe_id)
+        poller.close()
+        return await poller.run()
+
+    metrics = asyncio.run(scenario())
+
+    assert sorted(delivered) == ["a", "b"]
+    assert (metrics.completed, metrics.failed) == (2, 1)
@@ -1,9 +1,19 @@
 import argparse
+import asyncio
 import json
+import sqlite3
+import wave
 from pathlib import Path
 from typing import Any
 
-from rtzr_openapi_client import RTZROpenAPIClient
+from rtzr_openapi_client import AsyncRTZROpenAPIClient, RTZROpenAPIClient, UploadStats
+from transcript_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_MB, TranscriptCache
+from transcription_poller import MAX_INTERVAL_SEC, PollJob, TranscriptionPoller
+
+
+AUDIO_SUFFIXES = {".amr", ".flac", ".m4a", ".mp3", ".mp4", ".wav"}
+BATCH_CONCURRENCY = 8
+DEFAULT_OUTPUT_DIR = Path("data/transcripts")
 
 
 def build_config(args: argparse.Namespace) -> dict[str, Any]:
@@ -20,16 +30,207 @@ def build_config(args: argparse.Namespace) -> dict[str, Any]:
     return config
 
 
-def default_output_path(audio_path: Path) -> Path:
-    return Path("data/transcripts") / f"{audio_path.stem}.transcript.json"
+def cache_config(config: dict[str, Any], compact: bool) -> dict[str, Any]:
+    # Compacted uploads can transcribe differently, so they are cached apart.
+    return config | {"compact_audio": compact}
+
+
+def default_output_path(audio_path: Path, output_dir: Path = DEFAULT_OUTPUT_DIR) -> Path:
+    return output_dir / f"{audio_path.stem}.transcript.json"
+
+
+def find_audio_files(directory: Path) -> list[Path]:
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_file() and path.suffix.lower() in AUDIO_SUFFIXES
+    )
+
+
+def write_transcript(output_path: Path, transcript: dict[str, Any]) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(
+        json.dumps(transcript, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+
+
+def audio_duration_sec(audio_path: Path) -> float | None:
+    # Only WAV headers are read here; other formats start polling without an estimate.
+    try:
+        with wave.open(str(audio_path), "rb") as audio:
+            return audio.getnframes() / audio.getframerate()
+    except (wave.Error, EOFError, OSError, ZeroDivisionError):
+        return None
+
+
+def render_upload_stats(stats: UploadStats) -> str:
+    rendered = (
+        f"upload_mb={stats.bytes / (1024 * 1024):.1f} upload_mb_per_sec={stats.mb_per_sec:.1f}"
+    )
+    if stats.original_bytes is not None:
+        rendered += (
+            f" original_mb={stats.original_bytes / (1024 * 1024):.1f}"
+            f" size_ratio={stats.size_ratio:.2f} time_saved_sec={stats.time_saved_sec:.1f}"
+        )
+    return rendered
+
+
+async def transcribe_batch(
+    audio_paths: list[Path],
+    config: dict[str, Any],
+    output_dir: Path,
+    concurrency: int = BATCH_CONCURRENCY,
+    poll_interval_sec: float = 5,
+    timeout_sec: float = 900,
+    max_poll_interval_sec: float = MAX_INTERVAL_SEC,
+    compact: bool = False,
+    cache: TranscriptCache | None = None,
+) -> int:
+    # Uploads run as separate tasks, at most `concurrency` at a time. One poller loop
+    # tracks every submitted job and transcripts are written as soon as they finish.
+    # Cached files are saved up front and never reach the API.
+    if cache is not None:
+        misses = []
+        for audio_path in audio_paths:
+            transcript = cache.get(audio_path, cache_config(config, compact))
+            if transcript is None:
+                misses.append(audio_path)
+                continue
+            output_path = default_output_path(audio_path, output_dir)
+            write_transcript(output_path, transcript)
+            print(f"cache_hit={audio_path} saved={output_path}", flush=True)
+        print(
+            f"transcript_cache_hits={len(audio_paths) - len(misses)} misses={len(misses)}",
+            flush=True,
+        )
+        audio_paths = misses
+    if not audio_paths:
+        return 0
+
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    upload_stats: list[UploadStats] = []
+
+    def fail(audio_path: Path, reason: str) -> None:
+        nonlocal failures
+        failures += 1
+        print(f"failed={audio_path} error={reason}", flush=True)
+
+    def finish(job: PollJob, result: dict[str, Any]) -> None:
+        if result.get("status") != "completed":
+            fail(job.context, json.dumps(result, ensure_ascii=False))
+            return
+        output_path = default_output_path(job.context, output_dir)
+        try:
+            write_transcript(output_path, result)
+        except OSError as exc:
+            fail(job.context, repr(exc))
+            return
+        print(f"saved={output_path}", flush=True)
+        if cache is not None:
+            # The transcript is already saved, so a cache error does not fail the file.
+            try:
+                cache.put(job.context, cache_config(config, compact), result)
+            except (OSError, sqlite3.Error) as exc:
+                print(f"transcript_cache_error={job.context} error={exc!r}", flush=True)
+
+    async with AsyncRTZROpenAPIClient(max_connections=concurrency * 2) as client:
+        poller = TranscriptionPoller(
+            client.get_transcription,
+            on_result=finish,
+            min_interval_sec=poll_interval_sec,
+            max_interval_sec=max(max_poll_interval_sec, poll_interval_sec),
+            timeout_sec=timeout_sec,
+        )
+        polling = asyncio.create_task(poller.run())
+
+        async def submit(audio_path: Path) -> None:
+            stats: list[UploadStats] = []
+            try:
+                async with semaphore:
+                    submitted = await client.transcribe_file(
+                        audio_path, config, stats, compact=compact
+                    )
+            except Exception as exc:
+                fail(audio_path, repr(exc))
+                return
+            upload_stats.extend(stats)
+            poller.add(submitted["id"], audio_duration_sec(audio_path), context=audio_path)
+            print(
+                f"transcribe_id={submitted['id']} audio={audio_path} "
+                f"{render_upload_stats(stats[0])}",
+                flush=True,
+            )
+
+        try:
+            await asyncio.gather(*(submit(audio_path) for audio_path in audio_paths))
+        finally:
+            poller.close()
+        metrics = await polling
+
+    uploaded_mb = sum(stats.bytes for stats in upload_stats) / (1024 * 1024)
+    summary_line = f"uploaded_files={len(upload_stats)} uploaded_mb={uploaded_mb:.1f}"
+    if compact:
+        original_mb = sum(
+            stats.original_bytes or stats.bytes for stats in upload_stats
+        ) / (1024 * 1024)
+        time_saved_sec = sum(stats.time_saved_sec for stats in upload_stats)
+        summary_line += f" original_mb={original_mb:.1f} time_saved_sec={time_saved_sec:.1f}"
+    print(summary_line, flush=True)
+    summary = metrics.summary()
+    print(
+        f"poll_requests={summary['requests']} poll_errors={summary['errors']} "
+        f"requests_per_job={summary['requests_per_job']} "
+        f"detection_latency_mean_sec={summary['detection_latency_mean_sec']} "
+        f"detection_latency_max_sec={summary['detection_latency_max_sec']}",
+        flush=True,
+    )
+    return failures
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Transcribe an audio file with RTZR STT API."
+        description="Transcribe an audio file, or every audio file in a directory, "
+        "with RTZR STT API."
     )
-    parser.add_argument("audio", type=Path, help="Path to an audio file.")
+    parser.add_argument("audio", type=Path, help="Path to an audio file or a directory of them.")
     parser.add_argument("-o", "--output", type=Path, help="Where to save transcript JSON.")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Where to save <stem>.transcript.json files when --output is not given.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=BATCH_CONCURRENCY,
+        help="Maximum simultaneous uploads when transcribing a directory.",
+    )
+    parser.add_argument(
+        "--compact-audio",
+        action="store_true",
+        help="Downmix WAV/FLAC audio to 16 kHz mono before uploading when that makes it smaller.",
+    )
+    parser.add_argument(
+        "--transcript-cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Where to keep finished transcripts by audio content and config.",
+    )
+    parser.add_argument(
+        "--transcript-cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_MB,
+        help="Evict least recently used transcripts above this cache size.",
+    )
+    parser.add_argument(
+        "--no-transcript-cache",
+        dest="transcript_cache",
+        action="store_false",
+        help="Always upload and transcribe, even when a cached transcript exists.",
+    )
     parser.add_argument("--model-name", default="sommers", help="RTZR model_name value.")
     parser.add_argument("--language", default="ko", help="Language code for the selected model.")
     parser.add_argument(
@@ -57,7 +258,18 @@ def parse_args() -> argparse.Namespace:
         action="store_false",
         help="Keep filler and repeated speech expressions in the transcript.",
     )
-    parser.add_argument("--poll-interval", type=int, default=5)
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=5,
+        help="Seconds between polls. In directory mode, the shortest interval before backoff.",
+    )
+    parser.add_argument(
+        "--max-poll-interval",
+        type=float,
+        default=MAX_INTERVAL_SEC,
+        help="Longest backoff interval between polls of one job in directory mode.",
+    )
     parser.add_argument("--timeout", type=int, default=900)
     return parser.parse_args()
 
@@ -68,14 +280,60 @@ def main() -> None:
     if not audio_path.exists():
         raise FileNotFoundError(audio_path)
 
-    output_path = args.output or default_output_path(audio_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    config = build_config(args)
+    cache = None
+    if args.transcript_cache:
+        cache = TranscriptCache(args.transcript_cache_dir, max_mb=args.transcript_cache_max_mb)
+    try:
+        transcribe_path(audio_path, config, args, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def transcribe_path(
+    audio_path: Path,
+    config: dict[str, Any],
+    args: argparse.Namespace,
+    cache: TranscriptCache | None,
+) -> None:
+    if audio_path.is_dir():
+        if args.output:
+            raise ValueError("--output names one transcript; use --output-dir for a directory.")
+        audio_paths = find_audio_files(audio_path)
+        if not audio_paths:
+            raise FileNotFoundError(f"No audio files in {audio_path}")
+        failures = asyncio.run(
+            transcribe_batch(
+                audio_paths,
+                config,
+                args.output_dir,
+                concurrency=args.concurrency,
+                poll_interval_sec=args.poll_interval,
+                timeout_sec=args.timeout,
+                max_poll_interval_sec=args.max_poll_interval,
+                compact=args.compact_audio,
+                cache=cache,
+            )
+        )
+        if failures:
+            raise SystemExit(f"{failures} audio file(s) failed")
+        return
+
+    output_path = args.output or default_output_path(audio_path, args.output_dir)
+    cached_config = cache_config(config, args.compact_audio)
+    transcript = cache.get(audio_path, cached_config) if cache is not None else None
+    if transcript is not None:
+        write_transcript(output_path, transcript)
+        print(f"cache_hit={audio_path}")
+        print(f"saved={output_path}")
+        return
 
     client = RTZROpenAPIClient()
-    config = build_config(args)
-    submit = client.transcribe_file(audio_path, config)
+    upload_stats: list[UploadStats] = []
+    submit = client.transcribe_file(audio_path, config, upload_stats, compact=args.compact_audio)
     transcribe_id = submit["id"]
-    print(f"transcribe_id={transcribe_id}")
+    print(f"transcribe_id={transcribe_id} {render_upload_stats(upload_stats[0])}")
 
     transcript = client.wait_for_result(
         transcribe_id,
@@ -85,10 +343,9 @@ def main() -> None:
     if transcript.get("status") == "failed":
         raise RuntimeError(json.dumps(transcript, ensure_ascii=False, indent=2))
 
-    output_path.write_text(
-        json.dumps(transcript, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    write_transcript(output_path, transcript)
+    if cache is not None:
+        cache.put(audio_path, cached_config, transcript)
     print(f"saved={output_path}")
 
 
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+
+DEFAULT_CACHE_DIR = Path("data/cache/transcripts")
+DEFAULT_MAX_MB = 512
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class TranscriptCache:
+    """On-disk cache of completed transcripts keyed by audio content and STT config.
+
+    The key hashes the audio bytes together with the canonical JSON of the request
+    config, so a renamed or copied recording still hits while another model or option
+    misses. Transcripts are JSON files next to a SQLite index that maps keys to files
+    and tracks last use for LRU eviction. The index also remembers each audio file's
+    hash by path, size and mtime, so unchanged files are not read again; eviction drops
+    the hashes no remaining transcript uses.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path = DEFAULT_CACHE_DIR,
+        max_mb: float = DEFAULT_MAX_MB,
+    ) -> None:
+        self.directory = Path(cache_dir)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._index = sqlite3.connect(self.directory / "index.sqlite3")
+        self._index.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                audio_sha256 TEXT NOT NULL,
+                bytes INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+            CREATE INDEX IF NOT EXISTS entries_audio ON entries (audio_sha256);
+            CREATE TABLE IF NOT EXISTS audio_hashes (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+            """
+        )
+
+    def __len__(self) -> int:
+        return self._index.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def key(self, audio_path: Path, config: dict[str, Any]) -> str:
+        return entry_key(self.audio_hash(audio_path), config)
+
+    def audio_hash(self, audio_path: Path) -> str:
+        path = str(audio_path.resolve())
+        stat = audio_path.stat()
+        row = self._index.execute(
+            "SELECT sha256 FROM audio_hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (path, stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        if row is not None:
+            return row[0]
+
+        content = file_sha256(audio_path)
+        with self._index:
+            self._index.execute(
+                "INSERT OR REPLACE INTO audio_hashes VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, content),
+            )
+        return content
+
+    def get(self, audio_path: Path, config: dict[str, Any]) -> dict[str, Any] | None:
+        key = self.key(audio_path, config)
+        if self._index.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is None:
+            return None
+        try:
+            transcript = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # The file was removed or damaged outside the cache; forget the entry.
+            with self._index:
+                self._index.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return None
+
+        with self._index:
+            self._index.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        return transcript
+
+    def put(self, audio_path: Path, config: dict[str, Any], transcript: dict[str, Any]) -> None:
+        content = self.audio_hash(audio_path)
+        key = entry_key(content, config)
+        data = json.dumps(transcript, ensure_ascii=False).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        temporary_path = path.with_suffix(".tmp")
+        temporary_path.write_bytes(data)
+        temporary_path.replace(path)
+        with self._index:
+            self._index.execute(
+                "INSERT OR REPLACE INTO entries (key, audio_sha256, bytes, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, content, len(data), time.time()),
+            )
+            self._evict()
+
+    def close(self) -> None:
+        self._index.close()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _evict(self) -> None:
+        total = self._index.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self._index.execute("SELECT key, bytes FROM entries ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            evicted.append(key)
+            total -= size
+        self._index.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in evicted])
+        # File hashes are only worth keeping while a cached transcript still uses them.
+        self._index.execute(
+            "DELETE FROM audio_hashes WHERE sha256 NOT IN (SELECT audio_sha256 FROM entries)"
+        )
+        for key in evicted:
+            self._path(key).unlink(missing_ok=True)
+
+
+def entry_key(audio_sha256: str, config: dict[str, Any]) -> str:
+    return hashlib.sha256(f"{audio_sha256}\0{canonical_config(config)}".encode("utf-8")).hexdigest()
+
+
+def canonical_config(config: dict[str, Any]) -> str:
+    return json.dumps(config, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+MIN_INTERVAL_SEC = 2.0
+MAX_INTERVAL_SEC = 30.0
+BACKOFF_FACTOR = 1.6
+JITTER = 0.2
+# Rough transcription time per second of audio, used to delay the first poll.
+EXPECTED_SEC_PER_AUDIO_SEC = 0.1
+DONE_STATUSES = ("completed", "failed")
+
+
+@dataclass
+class PollJob:
+    transcribe_id: str
+    submitted_at: float
+    expected_sec: float
+    deadline: float
+    context: Any = None
+    polls: int = 0
+    overdue_polls: int = 0
+    last_polled_at: float | None = None
+
+
+@dataclass
+class PollerMetrics:
+    requests: int = 0
+    errors: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    detection_latencies: list[float] = field(default_factory=list)
+
+    def summary(self) -> dict[str, Any]:
+        finished = self.completed + self.failed + self.timed_out
+        latencies = self.detection_latencies
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "requests_per_job": round(self.requests / finished, 3) if finished else 0.0,
+            "detection_latency_mean_sec": (
+                round(sum(latencies) / len(latencies), 3) if latencies else 0.0
+            ),
+            "detection_latency_max_sec": round(max(latencies), 3) if latencies else 0.0,
+        }
+
+
+class TranscriptionPoller:
+    """Polls many transcription jobs from one asyncio loop.
+
+    The first poll of a job waits for its expected transcription time, estimated from
+    the audio duration, but never longer than `max_interval_sec`. After that the
+    interval grows by `backoff_factor` per poll up to `max_interval_sec`, with random
+    jitter so jobs submitted together spread out. Finished jobs are handed to
+    `on_result`, or put on `results` when no callback is given; a job whose callback
+    raises is counted as failed. Detection latency is the gap between the last
+    unfinished poll and the poll that saw the job finish, an upper bound on how late
+    completion was noticed.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[dict[str, Any]]],
+        on_result: Callable[[PollJob, dict[str, Any]], None] | None = None,
+        min_interval_sec: float = MIN_INTERVAL_SEC,
+        max_interval_sec: float = MAX_INTERVAL_SEC,
+        backoff_factor: float = BACKOFF_FACTOR,
+        jitter: float = JITTER,
+        timeout_sec: float = 900,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.fetch = fetch
+        self.on_result = on_result
+        self.min_interval_sec = min_interval_sec
+        self.max_interval_sec = max_interval_sec
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.timeout_sec = timeout_sec
+        self.metrics = PollerMetrics()
+        self.results: asyncio.Queue[tuple[PollJob, dict[str, Any]]] = asyncio.Queue()
+        self._rng = rng or random.Random()
+        self._schedule: list[tuple[float, int, PollJob]] = []
+        self._sequence = 0
+        self._wake = asyncio.Event()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._schedule)
+
+    def add(
+        self,
+        transcribe_id: str,
+        audio_duration_sec: float | None = None,
+        context: Any = None,
+    ) -> PollJob:
+        now = time.monotonic()
+        job = PollJob(
+            transcribe_id=transcribe_id,
+            submitted_at=now,
+            expected_sec=(audio_duration_sec or 0.0) * EXPECTED_SEC_PER_AUDIO_SEC,
+            deadline=now + self.timeout_sec,
+            context=context,
+        )
+        # Capped like later polls, so a long recording is still seen before its deadline.
+        first_delay = min(max(self.min_interval_sec, job.expected_sec), self.max_interval_sec)
+        self._push(job, now + first_delay)
+        return job
+
+    def close(self) -> None:
+        # `run` returns once every job added so far has finished.
+        self._closed = True
+        self._wake.set()
+
+    async def run(self) -> PollerMetrics:
+        while self._schedule or not self._closed:
+            if not self._schedule:
+                await self._wait(None)
+                continue
+            due_at = self._schedule[0][0]
+            if due_at > time.monotonic():
+                await self._wait(due_at - time.monotonic())
+                continue
+
+            now = time.monotonic()
+            due = []
+            while self._schedule and self._schedule[0][0] <= now:
+                due.append(heapq.heappop(self._schedule)[2])
+            results = await asyncio.gather(
+                *(self.fetch(job.transcribe_id) for job in due),
+                return_exceptions=True,
+            )
+            for job, result in zip(due, results):
+                self._handle(job, result, time.monotonic())
+        return self.metrics
+
+    def next_delay(self, job: PollJob, now: float) -> float:
+        remaining = job.expected_sec - (now - job.submitted_at)
+        if remaining > self.min_interval_sec:
+            delay = remaining
+        else:
+            delay = self.min_interval_sec * self.backoff_factor**job.overdue_polls
+            job.overdue_polls += 1
+        delay = min(delay, self.max_interval_sec)
+        return delay * self._rng.uniform(1.0 - self.jitter, 1.0)
+
+    def _handle(self, job: PollJob, result: dict[str, Any] | BaseException, now: float) -> None:
+        self.metrics.requests += 1
+        job.polls += 1
+        if isinstance(result, BaseException):
+            self.metrics.errors += 1
+            status = None
+        else:
+            status = result.get("status")
+
+        if status in DONE_STATUSES:
+            if job.last_polled_at is not None:
+                self.metrics.detection_latencies.append(now - job.last_polled_at)
+            if self._deliver(job, result) and status == "completed":
+                self.metrics.completed += 1
+            else:
+                self.metrics.failed += 1
+        elif now > job.deadline:
+            if self._deliver(job, {"id": job.transcribe_id, "status": "timed_out"}):
+                self.metrics.timed_out += 1
+            else:
+                self.metrics.failed += 1
+        else:
+            job.last_polled_at = now
+            self._push(job, now + self.next_delay(job, now))
+
+    def _deliver(self, job: PollJob, result: dict[str, Any]) -> bool:
+        # A callback that raises counts its job as failed; the other jobs keep polling.
+        if self.on_result is None:
+            self.results.put_nowait((job, result))
+            return True
+        try:
+            self.on_result(job, result)
+        except Exception:
+            return False
+        return True
+
+    def _push(self, job: PollJob, due_at: float) -> None:
+        self._sequence += 1
+        heapq.heappush(self._schedule, (due_at, self._sequence, job))
+        self._wake.set()
+
+    async def _wait(self, timeout: float | None) -> None:
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except TimeoutError:
+            pass